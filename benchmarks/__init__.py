@@ -0,0 +1,7 @@
+"""Performance benchmarks for :py:mod:`py_wlc`.
+
+Run with ``python -m benchmarks run -o results.json`` from the
+repository root, and compare two result files with ``python -m
+benchmarks compare baseline.json results.json``.
+
+"""
@@ -0,0 +1,105 @@
+"""Command line interface for the :py:mod:`py_wlc` benchmarks.
+
+Usage::
+
+    python -m benchmarks run [-o baseline.json] [names...]
+    python -m benchmarks compare baseline.json current.json [-t 0.1]
+
+``compare`` exits with a non-zero status if any benchmark is slower
+than the baseline by more than the threshold (a fraction, so ``0.1``
+is 10%).
+
+"""
+import argparse
+import json
+import platform
+import sys
+
+from .suite import BENCHMARKS, run
+
+
+def compare(baseline, current, threshold):
+    """Compare two sets of results, reporting regressions.
+
+    Arguments:
+      baseline (``dict``): The baseline results.
+      current (``dict``): The current results.
+      threshold (``float``): The allowed fractional slow-down.
+
+    Returns:
+      ``list`` of ``str``: The names of regressed benchmarks.
+
+    """
+    regressions = []
+    for name in sorted(current):
+        if name not in baseline:
+            print("{:<36} {:>12}".format(name, "new"))
+            continue
+        before = baseline[name]["per_call"]
+        after = current[name]["per_call"]
+        if not before:
+            # A zero baseline leaves the relative change undefined.
+            print("{:<36} {:>12}".format(name, "undefined"))
+            continue
+        change = (after - before) / before
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print("{:<36} {:>+11.1%} {}".format(name, change, flag))
+    return regressions
+
+
+def main(args):
+    """Run the benchmark CLI.
+
+    Arguments:
+      args (``list`` of ``str``): Arguments from command line.
+
+    Returns:
+      int: The exit status.
+
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                         description=__doc__.split("\n")[0])
+    commands = arg_parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("names", nargs="*",
+                            help="benchmarks to run (default all)")
+    run_parser.add_argument("-o", help="file to write results to")
+    run_parser.add_argument("-r", "--repeat", type=int, default=5,
+                            help="number of timing runs")
+    compare_parser = commands.add_parser("compare",
+                                         help="compare two result files")
+    compare_parser.add_argument("baseline", help="baseline results")
+    compare_parser.add_argument("current", help="current results")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                                help="allowed fractional slow-down")
+    args_ = arg_parser.parse_args(args)
+    if args_.command == "run":
+        unknown = set(args_.names).difference(BENCHMARKS)
+        if unknown:
+            arg_parser.error("unknown benchmarks: {}".format(
+                ", ".join(sorted(unknown))))
+        results = run(args_.names, args_.repeat)
+        for name, result in sorted(results.items()):
+            print("{:<36} {:>12.3f} us".format(name,
+                                               result["per_call"] * 1e6))
+        if args_.o is not None:
+            with open(args_.o, "w") as outfile:
+                json.dump({"python": platform.python_version(),
+                           "results": results}, outfile, indent=4,
+                          sort_keys=True)
+        return 0
+    if args_.command == "compare":
+        with open(args_.baseline) as file_:
+            baseline = json.load(file_)["results"]
+        with open(args_.current) as file_:
+            current = json.load(file_)["results"]
+        return 1 if compare(baseline, current, args_.threshold) else 0
+    arg_parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
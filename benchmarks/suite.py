@@ -0,0 +1,257 @@
+"""Benchmarks for the :py:mod:`py_wlc` hot paths.
+
+Each benchmark is a function, registered with :py:func:`benchmark`,
+that takes no arguments and returns the callable to time. Any set-up
+happens in the outer function, so it is excluded from the timings.
+
+"""
+import atexit
+import datetime
+import os
+import shutil
+import tempfile
+import timeit
+
+from py_wlc.data import WebTagData, WebTagParser
+from py_wlc.data.synthetic import SyntheticDatabook, cost_portfolio
+from py_wlc.economics import (AppraisalRunner, Cost, Discount, GdpDeflator,
+                              RenewalCycle, ResidualValueCalculator)
+from py_wlc.generic import ExtendedDict
+from py_wlc.utils.summation import ExactSum
+
+
+BENCHMARKS = {}
+"""The registered benchmarks, keyed by name."""
+
+
+def benchmark(func):
+    """Register a benchmark under its function name."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    """Run the benchmarks, returning the best time per call for each.
+
+    Arguments:
+      names (``list`` of ``str``, optional): The benchmarks to run.
+        Defaults to all registered benchmarks.
+      repeat (``int``, optional): The number of timing runs; the best
+        is reported. Defaults to ``5``.
+      min_time (``float``, optional): The minimum duration of each
+        timing run, in seconds. Defaults to ``0.2``.
+
+    Returns:
+      ``dict``: The results, keyed by benchmark name.
+
+    """
+    results = {}
+    for name in names or sorted(BENCHMARKS):
+        func = BENCHMARKS[name]()
+        timer = timeit.Timer(func)
+        number = 1
+        while timer.timeit(number) < min_time / 10:
+            number *= 10
+        best = min(timer.repeat(repeat, number)) / number
+        results[name] = {"per_call": best, "number": number}
+    return results
+
+
+@benchmark
+def discount_first_touch():
+    def run():
+        # timeit's setup only runs once per repeat, so clear the shared
+        # curves here to keep every call cold.
+        Discount.clear_cache()
+        return Discount(2010)[2310]
+    return run
+
+
+@benchmark
+def discount_steady_state():
+    discount = Discount(2010)
+    _ = discount[2310]
+    return lambda: discount[2150]
+
+
+@benchmark
+def deflator_first_touch():
+    rates = {year: 0.025 for year in range(2000, 2060)}
+    return lambda: GdpDeflator(2010, rates, True)[2200]
+
+
+@benchmark
+def deflator_steady_state():
+    deflator = GdpDeflator(2010, {year: 0.025 for year in
+                                  range(2000, 2060)}, True)
+    _ = deflator[2200], deflator[1950]
+    return lambda: deflator[2100]
+
+
+@benchmark
+def cost_init():
+    discount = Discount(2010)
+    deflator = GdpDeflator(2010, {2010: 0.025}, True)
+    return lambda: Cost(100, Cost.REAL | Cost.MARKET_PRICE, 2040,
+                        discount, deflator, 1.19)
+
+
+@benchmark
+def cost_as_type():
+    cost = Cost(100, Cost.NOMINAL, 2040, Discount(2010),
+                GdpDeflator(2010, {2010: 0.025}, True), 1.19)
+    return lambda: cost.as_type(Cost.PRESENT_VALUE | Cost.MARKET_PRICE)
+
+
+@benchmark
+def cost_validate_type():
+    return lambda: Cost.validate_type(Cost.PRESENT_VALUE | Cost.MARKET_PRICE)
+
+
+def _costs(rows=1000):
+    """Build a portfolio of synthetic costs."""
+    discount = Discount(2010)
+    deflator = GdpDeflator(2010, {2010: 0.025}, True)
+    return [Cost(value, type_, year, discount, deflator, adjustment)
+            for value, type_, year, adjustment in cost_portfolio(rows)]
+
+
+@benchmark
+def cost_as_type_all_types():
+    costs = _costs()
+    return lambda: [[cost.as_type(type_) for type_ in Cost.TYPES]
+                    for cost in costs]
+
+
+@benchmark
+def cost_conversion_matrix():
+    costs = _costs()
+    return lambda: Cost.conversion_matrix(costs)
+
+
+def _residual_value(method):
+    calc = ResidualValueCalculator(method)
+    return lambda: calc.calculate(1000, 40, 2010, 2035, 100)
+
+
+@benchmark
+def residual_value_linear():
+    return _residual_value("linear")
+
+
+@benchmark
+def residual_value_double_declining():
+    return _residual_value("double-declining")
+
+
+@benchmark
+def residual_value_sum_of_years():
+    return _residual_value("sum of years' digits")
+
+
+ASSETS = [(1000.0 + index, 5 + index % 60, 1990 + index % 40, 50.0)
+          for index in range(200)]
+
+
+@benchmark
+def residual_value_double_loop():
+    calc = ResidualValueCalculator("sum of years' digits")
+    return lambda: [[calc.calculate(value, life, build, year, scrap)
+                     if year >= build else 0.0
+                     for year in range(2010, 2070)]
+                    for value, life, build, scrap in ASSETS]
+
+
+@benchmark
+def residual_value_schedule():
+    calc = ResidualValueCalculator("sum of years' digits")
+    return lambda: calc.schedule(ASSETS, 2010, 2069)
+
+
+@benchmark
+def renewal_cycle_total():
+    cycle = RenewalCycle(Discount(2010), ResidualValueCalculator("linear"),
+                         2010, 2129)
+    assets = [(1000.0 + index, 5 + index % 76, 1950 + index % 80, 0.0)
+              for index in range(10000)]
+    return lambda: cycle.total(assets)
+
+
+@benchmark
+def deflator_rebase_prices():
+    deflator = GdpDeflator(2010, {year: 0.025 for year in
+                                  range(2000, 2060)}, True)
+    values = [1000.0 + index for index in range(10000)]
+    years = [1980 + index % 60 for index in range(10000)]
+    return lambda: deflator.rebase_prices(values, years, 2015)
+
+
+@benchmark
+def sum_builtin():
+    values = [cost[0] for cost in cost_portfolio(100000)]
+    return lambda: sum(values)
+
+
+@benchmark
+def sum_exact():
+    values = [cost[0] for cost in cost_portfolio(100000)]
+    return lambda: float(ExactSum(values))
+
+
+@benchmark
+def appraisal_runner_serial():
+    runner = AppraisalRunner(Discount(2010), GdpDeflator(2010, {}), 2010,
+                             2069, workers=0)
+    costs = list(cost_portfolio(100000))
+    return lambda: runner.run(costs)
+
+
+@benchmark
+def extended_dict_out_of_range():
+    ext_dict = ExtendedDict({year: 0.03 for year in range(300)})
+    return lambda: (ext_dict[-1], ext_dict[400])
+
+
+def _json_dir():
+    """Create a temporary directory of synthetic JSON extracts."""
+    dir_ = tempfile.mkdtemp(prefix="py_wlc_bench_")
+    atexit.register(shutil.rmtree, dir_, True)
+    for index in range(10):
+        databook = SyntheticDatabook(seed=index, released=datetime.date(
+            2005 + index, 1, 1))
+        latest = os.path.join(dir_, "synthetic_{}.json".format(index))
+        databook.write_json(latest)
+    return dir_, latest
+
+
+@benchmark
+def webtag_from_json():
+    _, latest = _json_dir()
+    return lambda: WebTagData.from_json(latest).discount
+
+
+@benchmark
+def webtag_from_latest_json():
+    dir_, _ = _json_dir()
+    return lambda: WebTagData.from_latest_json(dir_).discount
+
+
+@benchmark
+def webtag_from_json_large():
+    dir_ = tempfile.mkdtemp(prefix="py_wlc_bench_")
+    atexit.register(shutil.rmtree, dir_, True)
+    file = os.path.join(dir_, "large.json")
+    SyntheticDatabook(years=5000).write_json(file)
+    def func():
+        data = WebTagData.from_json(file)
+        return [data.series(name) for name in data.available_series()]
+    return func
+
+
+@benchmark
+def webtag_parser_extract_all():
+    book = SyntheticDatabook(years=1000).book()
+    def func():
+        with WebTagParser(os.devnull, book) as parser:
+            return parser.extract_all()
+    return func
@@ -8,3 +8,6 @@ classes for handling that data.
 
 from .webtag_parser import WebTagParser
 from .webtag_data import WebTagData
+from .webtag_diff import SchemeDelta, WebTagDiff
+from .webtag_holder import WebTagHolder
+from .webtag_watcher import WebTagWatcher
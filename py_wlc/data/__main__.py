@@ -0,0 +1,11 @@
+"""Run the :py:mod:`~.webtag_parser` command line interface.
+
+Usage::
+
+    python -m py_wlc.data databook.xls [-o output.json] [-v] [-c] [-z]
+
+"""
+from .webtag_parser import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Synthetic WebTAG data and cost portfolios for load testing.
+
+Everything generated here is deterministic for a given ``seed``, so
+benchmark results are comparable across machines and commits.
+
+:py:class:`SyntheticDatabook` generates a Databook whose layout follows
+:py:class:`~.WebTagParser`'s ``CHECK``, ``VERSION``, ``DATE``, ``BASE``
+and ``LOCATIONS`` (including any series added to
+:py:mod:`~.webtag_schema`). It can be provided to the parser as an
+in-memory workbook, written out as an Excel file (this requires the
+optional ``xlwt`` package), or written out directly as the JSON extract
+used by :py:class:`~.WebTagData`.
+
+:py:func:`cost_portfolio` generates cost records in the format used by
+:py:mod:`~.economics.stream`.
+
+"""
+import datetime
+import json
+import random
+
+import xlrd
+
+from ..economics import Cost
+from .webtag_parser import WebTagParser
+from .webtag_schema import SCHEMA
+
+
+class _Cell:
+    """A worksheet cell."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SyntheticSheet:
+    """An in-memory worksheet, stored as a dictionary of columns.
+
+    Provides the subset of the ``xlrd.sheet.Sheet`` interface used by
+    :py:class:`~.WebTagParser`.
+
+    Arguments:
+      name (``str``): The name of the worksheet.
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}
+        self.nrows = 0
+        self.ncols = 0
+
+    def set(self, row, col, value):
+        """Set the value of the cell at ``(row, col)``."""
+        column = self.columns.setdefault(col, [])
+        if len(column) <= row:
+            column.extend([""] * (row + 1 - len(column)))
+        column[row] = value
+        self.nrows = max(self.nrows, row + 1)
+        self.ncols = max(self.ncols, col + 1)
+
+    def cell(self, row, col):
+        """The cell at ``(row, col)``."""
+        return _Cell(self.cell_value(row, col))
+
+    def cell_value(self, row, col):
+        """The value of the cell at ``(row, col)``."""
+        if not (0 <= row < self.nrows and 0 <= col < self.ncols):
+            raise IndexError("Cell ({}, {}) out of range".format(row, col))
+        column = self.columns.get(col, [])
+        return column[row] if row < len(column) else ""
+
+    def col_values(self, col, start_rowx=0, end_rowx=None):
+        """The values in a column, between the specified rows."""
+        column = self.columns.get(col, [])
+        column = column + [""] * (self.nrows - len(column))
+        return column[start_rowx:end_rowx]
+
+
+class SyntheticBook:
+    """An in-memory workbook of :py:class:`SyntheticSheet` objects.
+
+    Provides the subset of the ``xlrd.Book`` interface used by
+    :py:class:`~.WebTagParser`.
+
+    """
+
+    datemode = 0
+
+    def __init__(self):
+        self.sheets = {}
+
+    def sheet(self, name):
+        """Retrieve or create the named worksheet."""
+        return self.sheets.setdefault(name, SyntheticSheet(name))
+
+    def sheet_by_name(self, name):
+        """The named worksheet."""
+        try:
+            return self.sheets[name]
+        except KeyError:
+            raise xlrd.XLRDError("No sheet named <{!r}>".format(name))
+
+    def unload_sheet(self, name):
+        """Sheets are always loaded; provided for compatibility."""
+        pass
+
+    def release_resources(self):
+        """No resources are held; provided for compatibility."""
+        pass
+
+
+class SyntheticDatabook:
+    """A randomly-generated, WebTAG-shaped Databook.
+
+    Every series in :py:mod:`~.webtag_schema` is generated according to
+    its kind: ``"discount"`` series use the Green Book rate bands,
+    ``"growth"`` series are annual rates around 2.2%, and ``"values"``
+    series are random walks.
+
+    Arguments:
+      seed (``int``, optional): The random seed. Defaults to ``0``.
+      years (``int``, optional): The number of years in each annual
+        series. Defaults to ``100``.
+      base_year (``int``, optional): The price base year, and the first
+        year of each annual series. Defaults to ``2010``.
+      version (``str``, optional): The Databook version. Defaults to
+        ``"Synthetic"``.
+      released (``datetime.date``, optional): The release date.
+        Defaults to 1st December 2014.
+
+    Attributes:
+      series (``dict``): The generated series, keyed by name.
+
+    """
+
+    BANDS = (("0-30", 0.035), ("31-75", 0.03), ("76-125", 0.025),
+             ("126-200", 0.02), ("201-300", 0.015), ("301 and over", 0.01))
+    """Discount rate bands used for ``"discount"`` series."""
+
+    def __init__(self, seed=0, years=100, base_year=2010,
+                 version="Synthetic", released=datetime.date(2014, 12, 1)):
+        self.seed = seed
+        self.years = years
+        self.base_year = base_year
+        self.version = version
+        self.released = released
+        rand = random.Random(seed)
+        self.series = {name: self._generate(spec.kind, rand)
+                       for name, spec in sorted(SCHEMA.items())}
+
+    def _generate(self, kind, rand):
+        """Generate a series of the specified kind."""
+        if kind == "discount":
+            return dict(self.BANDS)
+        years = range(self.base_year, self.base_year + self.years)
+        if kind == "growth":
+            return {year: round(rand.gauss(0.022, 0.004), 4)
+                    for year in years}
+        value = rand.uniform(10, 60)
+        series = {}
+        for year in years:
+            series[year] = value
+            value *= 1 + rand.gauss(0.01, 0.02)
+        return series
+
+    def book(self):
+        """Lay the Databook out as an in-memory workbook.
+
+        Returns:
+          :py:class:`SyntheticBook`: The workbook, suitable for the
+            ``book`` argument of :py:class:`~.WebTagParser`.
+
+        """
+        book = SyntheticBook()
+        sheet, row, col, value = WebTagParser.CHECK
+        book.sheet(sheet).set(row, col, value)
+        sheet, row, col = WebTagParser.VERSION
+        book.sheet(sheet).set(row, col, self.version)
+        sheet, version_col, date_col = WebTagParser.DATE
+        date = xlrd.xldate.xldate_from_date_tuple(
+            self.released.timetuple()[:3], book.datemode)
+        book.sheet(sheet).set(1, version_col, self.version)
+        book.sheet(sheet).set(1, date_col, date)
+        sheet, label_col, base_col, label = WebTagParser.BASE
+        book.sheet(sheet).set(5, label_col, label)
+        book.sheet(sheet).set(5, base_col, float(self.base_year))
+        for name, data in self.series.items():
+            sheet_name, start_row, key_col, value_col = \
+                WebTagParser.LOCATIONS[name]
+            sheet = book.sheet(sheet_name)
+            sheet.set(2, 0, "Synthetic Table {}".format(sheet_name))
+            sheet.set(3, 0, "Synthetic data")
+            for offset, key in enumerate(data):
+                if isinstance(key, int):
+                    sheet.set(start_row + offset, key_col, float(key))
+                else:
+                    sheet.set(start_row + offset, key_col, key)
+                sheet.set(start_row + offset, value_col, data[key])
+        return book
+
+    def extract(self, source="synthetic.xls"):
+        """The data as :py:meth:`~.WebTagParser.extract_all` returns it.
+
+        Arguments:
+          source (``str``, optional): The name to record as the source.
+            Defaults to ``"synthetic.xls"``.
+
+        Returns:
+          dict: The extracted data.
+
+        """
+        data = {}
+        for name, series in self.series.items():
+            sheet_name = WebTagParser.LOCATIONS[name][0]
+            data[name] = dict(series,
+                              title="Synthetic Table {}".format(sheet_name),
+                              table="Synthetic data")
+        data["source"] = source
+        data["released"] = str(self.released)
+        data["version"] = self.version
+        data["base_year"] = self.base_year
+        return data
+
+    def write_json(self, file, source="synthetic.xls"):
+        """Write the JSON extract used by :py:class:`~.WebTagData`.
+
+        Arguments:
+          file (``str``): The file to write to.
+          source (``str``, optional): The name to record as the source.
+            Defaults to ``"synthetic.xls"``.
+
+        """
+        with open(file, "w") as file_:
+            json.dump(self.extract(source), file_)
+
+    def write_xls(self, file):
+        """Write the Databook as an Excel workbook.
+
+        Arguments:
+          file (``str``): The file to write to.
+
+        Raises:
+          ImportError: If the optional ``xlwt`` package is not
+            installed.
+
+        """
+        import xlwt
+        book = self.book()
+        workbook = xlwt.Workbook()
+        for name, sheet in book.sheets.items():
+            worksheet = workbook.add_sheet(name)
+            for col, values in sheet.columns.items():
+                for row, value in enumerate(values):
+                    if value != "":
+                        worksheet.write(row, col, value)
+        workbook.save(file)
+
+
+def cost_portfolio(rows, seed=0, start_year=2010, end_year=2069):
+    """Generate a portfolio of cost records.
+
+    Records are generated lazily, so portfolios of millions of rows
+    never need to be held in memory. Years are skewed towards the start
+    of the appraisal (as capital costs are front-loaded), values are
+    log-normally distributed and types are drawn from a fixed mix of
+    nominal, real, market price and Present Value costs.
+
+    Arguments:
+      rows (``int``): The number of records to generate.
+      seed (``int``, optional): The random seed. Defaults to ``0``.
+      start_year (``int``, optional): The first year of the appraisal.
+        Defaults to ``2010``.
+      end_year (``int``, optional): The last year of the appraisal.
+        Defaults to ``2069``.
+
+    Yields:
+      ``tuple``: ``(value, type_, year, adjustment_factor)`` records.
+
+    """
+    rand = random.Random(seed)
+    types = (Cost.NOMINAL | Cost.FACTOR_COST,
+             Cost.NOMINAL | Cost.MARKET_PRICE,
+             Cost.REAL | Cost.FACTOR_COST,
+             Cost.REAL | Cost.MARKET_PRICE,
+             Cost.PRESENT_VALUE | Cost.FACTOR_COST)
+    weights = (40, 20, 20, 15, 5)
+    span = end_year - start_year
+    for _ in range(rows):
+        year = start_year + int(rand.triangular(0, span + 1, 0))
+        type_ = rand.choices(types, weights)[0]
+        adjustment_factor = 1.19 if type_ & Cost.MARKET_PRICE else 1.0
+        yield (round(rand.lognormvariate(9, 1.5), 2), type_,
+               min(year, end_year), adjustment_factor)
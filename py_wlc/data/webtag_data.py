@@ -1,19 +1,97 @@
 """Exposes the parsed WebTAG data as :py:mod:`py_wlc` objects."""
+from array import array
+import asyncio
 import datetime
+import hashlib
 import json
 import logging
 from os import path, walk
+import re
+import threading
+from types import MappingProxyType
+import weakref
 
-from ..economics import Discount, GdpDeflator
+from ..economics import Discount, FactorTable, GdpDeflator
+from ..generic import RateBands, ValueSeries
+from ..utils import instrumentation
+from .webtag_schema import SCHEMA
 
 
 logger = logging.getLogger(__name__)
 
 
+def digest(content):
+    """A digest identifying the content a release was loaded from.
+
+    Arguments:
+      content (``bytes``): The raw file content.
+
+    Returns:
+      ``str``: The hex digest.
+
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+_BAND = re.compile(r"(\d+)(?:[-\s]|$)")
+"""A band of years, e.g. ``"0-30"`` or ``"301 and over"``."""
+
+
+def _band_start(key):
+    """The first year of a band, or ``None`` if the key is not a band."""
+    match = _BAND.match(str(key))
+    return int(match.group(1)) if match else None
+
+
 class WebTagData:
-    """Holds the data extracted from WebTAG."""
+    """Holds the data extracted from WebTAG.
+
+    Arguments:
+      base_year (``int``): The price base year of the data.
+      released (``str``): The release date, as ``"YYYY-MM-DD"``.
+      version (``str``): The version of the Databook.
+      source (``str``): The file the data was extracted from.
+      horizon (``int``, optional): If supplied, the number of years
+        after the ``base_year`` to precompute factors for at load time
+        (see :py:class:`~.FactorTable`). Defaults to ``None``.
+      **data: The extracted data series.
+
+    Every series declared in :py:mod:`~.webtag_schema` is available
+    by name, either as an attribute (e.g. ``data.rail_fuel_duty``) or
+    via :py:meth:`series`. Each series object is only built when it is
+    first accessed.
+
+    Instances loaded through :py:meth:`shared` (including by
+    :py:meth:`from_json` and :py:meth:`from_latest_json`) are shared by
+    every caller loading the same release, so are read-only. Callers
+    requesting a ``horizon`` get their own read-only view of the shared
+    instance, with its own :py:attr:`factors`.
+
+    Attributes:
+      factors (:py:class:`~.FactorTable` or ``None``): The precomputed
+        factors, if a ``horizon`` was supplied.
+
+    """
+
+    PARSERS = {"discount": "_parse_discount",
+               "growth": "_parse_deflator",
+               "values": "_parse_values"}
+    """Parsing methods for each kind of series in the schema."""
+
+    _SHARED = weakref.WeakValueDictionary()
+    """The shared instance of each release still in use, keyed by
+    ``(source, version, released, base_year, digest)``."""
 
-    def __init__(self, base_year, released, version, source, **data):
+    _SHARED_LOCK = threading.Lock()
+
+    _ATTRIBUTES = frozenset(("base_year", "released", "version", "source",
+                             "factors"))
+    """Instance attributes, which series names must not shadow."""
+
+    _frozen = False
+
+    def __init__(self, base_year, released, version, source,
+                 horizon=None, **data):
         self.base_year = base_year
         released = datetime.datetime.strptime(released, "%Y-%m-%d")
         self.released = released.date()
@@ -21,10 +99,170 @@ class WebTagData:
             logger.warning("WebTAG data is more than one year old")
         self.version = version
         self.source = source
-        self.discount = self._parse_discount(data.get("discount_rate"),
-                                             self.base_year)
-        self.deflator = self._parse_deflator(data.get("gdp_growth"),
-                                             self.base_year)
+        self._data = data
+        self._series = {}
+        self.factors = None
+        if horizon is not None:
+            self.factors = FactorTable(self.discount, self.deflator,
+                                       self.base_year,
+                                       self.base_year + horizon)
+
+    def __getattr__(self, name):
+        if (name.startswith("_") or name not in SCHEMA or
+                name in self._ATTRIBUTES or hasattr(type(self), name)):
+            raise AttributeError(name)
+        return self.series(name)
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError("Shared WebTagData is read-only.")
+        super().__setattr__(name, value)
+
+    @classmethod
+    def shared(cls, data, horizon=None, digest=None):
+        """The shared, read-only instance for a release.
+
+        Releases are identified by their ``source``, ``version``,
+        ``released`` date and ``base_year``, and the ``digest`` of the
+        content they were loaded from; the first call for a release
+        creates the instance, and later calls return it for as long as
+        it is still referenced elsewhere. Hits and misses are recorded
+        through :py:mod:`~.instrumentation`.
+
+        Arguments:
+          data (``dict``): The extracted data, as the keyword arguments
+            for a new instance.
+          horizon (``int``, optional): The number of years to
+            precompute factors for. If supplied, a view of the shared
+            instance with its own :py:attr:`factors` is returned
+            instead, leaving the shared instance unchanged. Defaults to
+            ``None``.
+          digest (``str``, optional): A digest of the content ``data``
+            was parsed from (see :py:func:`digest`), so that a file
+            edited without changing its metadata is not served from
+            the stale instance. Defaults to ``None``.
+
+        Returns:
+          :py:class:`~.WebTagData`: The shared instance, or a view of
+            it if a ``horizon`` was supplied.
+
+        """
+        key = (data.get("source"), data.get("version"),
+               data.get("released"), data.get("base_year"), digest)
+        with cls._SHARED_LOCK:
+            instance = cls._SHARED.get(key)
+            if instance is None:
+                if instrumentation.ENABLED:
+                    instrumentation.count(__name__, "registry_miss")
+                instance = cls(**data)
+                instance._data = MappingProxyType(instance._data)
+                instance._frozen = True
+                cls._SHARED[key] = instance
+            elif instrumentation.ENABLED:
+                instrumentation.count(__name__, "registry_hit")
+        if horizon is None:
+            return instance
+        return instance._view(horizon)
+
+    def _view(self, horizon):
+        """A read-only view sharing this instance's series.
+
+        The view keeps this instance alive, and has its own
+        :py:attr:`factors`, so this instance is not modified.
+
+        Arguments:
+          horizon (``int``): The number of years to precompute factors
+            for.
+
+        Returns:
+          :py:class:`~.WebTagData`: The new view.
+
+        """
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        object.__setattr__(view, "_shared", self)
+        object.__setattr__(view, "factors", FactorTable(
+            self.discount, self.deflator, self.base_year,
+            self.base_year + horizon
+        ))
+        object.__setattr__(view, "_frozen", True)
+        return view
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget the shared instance of every release.
+
+        Existing instances are unaffected; releases loaded afterwards
+        create new shared instances.
+
+        """
+        with cls._SHARED_LOCK:
+            cls._SHARED.clear()
+
+    @property
+    def discount(self):
+        """The discount factors, from the ``discount_rate`` series.
+
+        Returns:
+          :py:class:`~.Discount`: The discount factors.
+
+        """
+        return self.series("discount_rate")
+
+    @discount.setter
+    def discount(self, value):
+        self._series["discount_rate"] = value
+
+    @property
+    def deflator(self):
+        """The GDP deflator, from the ``gdp_growth`` series.
+
+        Returns:
+          :py:class:`~.GdpDeflator`: The GDP deflator factors.
+
+        """
+        return self.series("gdp_growth")
+
+    @deflator.setter
+    def deflator(self, value):
+        self._series["gdp_growth"] = value
+
+    @staticmethod
+    def available_series():
+        """Show the series declared in :py:mod:`~.webtag_schema`.
+
+        Returns:
+          ``list`` of ``str``: The available series names.
+
+        """
+        return list(SCHEMA.keys())
+
+    def series(self, name):
+        """Retrieve a named series, building it on first access.
+
+        Series that are absent from the extracted data are built from
+        ``None``, giving the defaults described for each parser.
+
+        Arguments:
+          name (``str``): The name of the series (must be in
+            :py:meth:`available_series`).
+
+        Returns:
+          The series object for the kind declared in the schema.
+
+        Raises:
+          KeyError: If ``name`` is not a declared series.
+
+        """
+        try:
+            return self._series[name]
+        except KeyError:
+            pass
+        if instrumentation.ENABLED:
+            instrumentation.count(__name__, "series_build")
+        parser = getattr(self, self.PARSERS[SCHEMA[name].kind])
+        return self._series.setdefault(name, parser(self._data.get(name),
+                                                    self.base_year))
 
     @staticmethod
     def _parse_deflator(data, base_year):
@@ -42,11 +280,9 @@ class WebTagData:
 
         """
         if data is not None:
-            rates = {}
-            for key, val in data.items():
-                if key.isdigit():
-                    rates[int(key)] = float(val)
-            return GdpDeflator(base_year, rates, True)
+            return GdpDeflator.from_arrays(
+                base_year, *WebTagData._year_arrays(data), extend=True
+            )
         return GdpDeflator(base_year, {base_year: 0.0}, True)
 
     @staticmethod
@@ -55,6 +291,7 @@ class WebTagData:
 
         Assumes that all years will be in dash-separated or space-
         separated format, with the first part being the start year.
+        Other keys (e.g. ``"title"`` or ``"2010/11"``) are skipped.
 
         Arguments:
           data (``dict`` or ``None``): The dictionary of discount rate
@@ -68,57 +305,199 @@ class WebTagData:
 
         """
         if data is not None:
-            rates = {}
-            for key, val in data.items():
-                if "-" in key:
-                    key = int(key.split("-")[0])
-                else:
-                    key = key.split(" ")[0]
-                    if key.isdigit():
-                        key = int(key)
-                    else:
-                        continue  # pragma: no cover
-                rates[key] = val
-            return Discount(base_year, rates)
+            return Discount(base_year, RateBands.from_arrays(
+                *WebTagData._year_arrays(data, bands=True)
+            ))
         return Discount(base_year)
 
+    @staticmethod
+    def _parse_values(data, base_year):
+        """Parse annual values from WebTAG into :py:class:`~.ValueSeries`.
+
+        Non-year keys (e.g. ``"title"`` and ``"table"``) are ignored.
+
+        Arguments:
+          data (``dict`` or ``None``): The dictionary of annual values
+            (or ``None`` - this will produce ``None``).
+          base_year (``int``): Unused; accepted for consistency with
+            the other parsers.
+
+        Returns:
+          :py:class:`~.ValueSeries` or ``None``: The new series.
+
+        """
+        _ = base_year
+        if data is None:
+            return None
+        return ValueSeries.from_arrays(*WebTagData._year_arrays(data))
+
+    @staticmethod
+    def _year_arrays(data, bands=False):
+        """Decode the annual entries of a series into sorted arrays.
+
+        Non-year keys (e.g. ``"title"`` and ``"table"``) are skipped.
+        The keys are filtered, converted and looked up by builtins, so
+        long series are decoded without a Python-level loop over them
+        (unless they are out of order, or keyed by ``int``).
+
+        Arguments:
+          data (``dict``): The series, keyed by year.
+          bands (``bool``, optional): Whether the keys are bands of
+            years (e.g. ``"0-30"`` or ``"301 and over"``), to be keyed
+            by the first year of each band. Defaults to ``False``.
+
+        Returns:
+          ``tuple`` of ``array.array``: The years, in ascending order,
+            and the value for each year.
+
+        """
+        if bands:
+            starts = list(map(_band_start, data))
+            keys = [key for key, start in zip(data, starts)
+                    if start is not None]
+            years = [start for start in starts if start is not None]
+        else:
+            try:
+                keys = list(filter(str.isdigit, data))
+            except TypeError:
+                keys = [key for key in data if str(key).isdigit()]
+            years = list(map(int, keys))
+        values = list(map(float, map(data.__getitem__, keys)))
+        if years != sorted(years):
+            ordered = sorted(zip(years, values))
+            years = [year for year, _ in ordered]
+            values = [value for _, value in ordered]
+        return array("l", years), array("d", values)
+
     @classmethod
-    def from_latest_json(cls, dir_):
+    def from_latest_json(cls, dir_, horizon=None, shared=True):
         """Extract data from the most recent JSON in the directory.
 
+        By default the result is the read-only instance shared by every
+        caller loading the same release (see :py:meth:`shared`), so
+        setting its attributes raises ``AttributeError``; pass
+        ``shared=False`` for a private instance that can be modified.
+
         Arguments:
           dir_ (``str``): The directory to start searching from.
+          horizon (``int``, optional): The number of years to
+            precompute factors for. Defaults to ``None``.
+          shared (``bool``, optional): Whether to return the shared
+            instance. Defaults to ``True``.
 
         Returns:
-          :py:class:`~.WebTagData`: A new class instance.
+          :py:class:`~.WebTagData`: The data for the release.
 
         """
-        latest_data = latest_date = None
-        for curr_dir, _, files in walk(dir_):
-            for file in files:
-                with open(path.join(curr_dir, file)) as file_:
-                    try:
-                        data = json.load(file_)
-                    except ValueError:
-                        continue
-                    date = data.get("released", "")
-                    if latest_date is None or date > latest_date:
-                        latest_data = data
-                        latest_date = date
-        if latest_data is not None:
-            return cls(**latest_data)
+        latest = cls._find_latest_json(dir_)
+        if latest is not None:
+            return cls._load(*latest, horizon=horizon, shared=shared)
 
     @classmethod
-    def from_json(cls, file):
+    def from_json(cls, file, horizon=None, shared=True):
         """Extract data from the specified JSON.
 
+        By default the result is the read-only instance shared by every
+        caller loading the same release (see :py:meth:`shared`), so
+        setting its attributes raises ``AttributeError``; pass
+        ``shared=False`` for a private instance that can be modified.
+
+        Arguments:
+          file (``str``): The file to import from.
+          horizon (``int``, optional): The number of years to
+            precompute factors for. Defaults to ``None``.
+          shared (``bool``, optional): Whether to return the shared
+            instance. Defaults to ``True``.
+
+        Returns:
+          :py:class:`~.WebTagData`: The data for the release.
+
+        """
+        with open(file, "rb") as file_:
+            content = file_.read()
+        return cls._load(json.loads(content.decode("utf-8")),
+                         digest(content), horizon=horizon, shared=shared)
+
+    @classmethod
+    async def from_latest_json_async(cls, dir_, horizon=None,
+                                     executor=None, shared=True):
+        """Asynchronous version of :py:meth:`from_latest_json`.
+
+        The directory walk, JSON parsing and object construction all
+        run in ``executor``, so the event loop is never blocked.
+
+        Arguments:
+          dir_ (``str``): The directory to start searching from.
+          horizon (``int``, optional): The number of years to
+            precompute factors for. Defaults to ``None``.
+          executor (``concurrent.futures.Executor``, optional): The
+            executor to run in. Defaults to the loop's default
+            executor.
+          shared (``bool``, optional): Whether to return the shared,
+            read-only instance. Defaults to ``True``.
+
+        Returns:
+          :py:class:`~.WebTagData`: The data for the release.
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, cls.from_latest_json,
+                                          dir_, horizon, shared)
+
+    @classmethod
+    async def from_json_async(cls, file, horizon=None, executor=None,
+                              shared=True):
+        """Asynchronous version of :py:meth:`from_json`.
+
         Arguments:
           file (``str``): The file to import from.
+          horizon (``int``, optional): The number of years to
+            precompute factors for. Defaults to ``None``.
+          executor (``concurrent.futures.Executor``, optional): The
+            executor to run in. Defaults to the loop's default
+            executor.
+          shared (``bool``, optional): Whether to return the shared,
+            read-only instance. Defaults to ``True``.
 
         Returns:
-          :py:class:`~.WebTagData`: A new class instance.
+          :py:class:`~.WebTagData`: The data for the release.
 
         """
-        with open(file) as file_:
-            data = json.load(file_)
-        return cls(**data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, cls.from_json,
+                                          file, horizon, shared)
+
+    @classmethod
+    def _load(cls, data, digest_, horizon, shared):
+        """Create the shared or a private instance for loaded data."""
+        if shared:
+            return cls.shared(data, horizon, digest_)
+        return cls(horizon=horizon, **data)
+
+    @staticmethod
+    def _find_latest_json(dir_):
+        """Find the most recently released JSON data in the directory.
+
+        Arguments:
+          dir_ (``str``): The directory to start searching from.
+
+        Returns:
+          ``tuple`` or ``None``: The parsed JSON data and the
+            :py:func:`digest` of its content, or ``None`` if no valid
+            JSON files were found.
+
+        """
+        latest = latest_date = None
+        for curr_dir, _, files in walk(dir_):
+            for file in files:
+                with open(path.join(curr_dir, file), "rb") as file_:
+                    content = file_.read()
+                try:
+                    data = json.loads(content.decode("utf-8"))
+                except ValueError:
+                    continue
+                date = data.get("released", "")
+                if latest_date is None or date > latest_date:
+                    latest = data, digest(content)
+                    latest_date = date
+        return latest
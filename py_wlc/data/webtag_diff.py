@@ -0,0 +1,169 @@
+"""Differences between two releases of the WebTAG data.
+
+When a new Databook is released, usually only a few years of a few
+series change. :py:class:`WebTagDiff` finds the first year of the
+appraisal period affected by each changed series, then recalculates
+only the affected suffix of the factor table and only the costs
+incurred in those years, rather than re-running every appraisal.
+
+"""
+from collections import namedtuple
+
+from ..economics import Cost, FactorTable
+from ..economics.stream import convert_records
+from ..utils.summation import ExactSum
+from .webtag_schema import SCHEMA
+
+
+SchemeDelta = namedtuple("SchemeDelta", ["records", "affected", "delta"])
+"""The number of cost records in a scheme, the number affected by the
+new release, and the change in the scheme's total."""
+
+
+class WebTagDiff:
+    """Compares two releases of the WebTAG data series by series.
+
+    Arguments:
+      old (:py:class:`~.WebTagData`): The previous release.
+      new (:py:class:`~.WebTagData`): The new release.
+      start_year (``int``): The first year of the appraisal period.
+      end_year (``int``): The last year of the appraisal period.
+
+    Attributes:
+      changes (``dict``): The first year of the appraisal period in
+        which each changed series differs, keyed by series name.
+        Unchanged series (and those changing only outside the period)
+        are omitted.
+      first_year (``int`` or ``None``): The first year in which the
+        discount or deflation factors differ, or ``None`` if neither
+        differs within the appraisal period.
+      old_factors (:py:class:`~.FactorTable`): The previous release's
+        factors over the appraisal period.
+      new_factors (:py:class:`~.FactorTable`): The new release's
+        factors, recalculated from :py:attr:`first_year` onwards.
+
+    Raises:
+      ValueError: If ``end_year`` precedes ``start_year``.
+
+    """
+
+    COMPARATORS = {"discount": "_compare_discount",
+                   "growth": "_compare_growth",
+                   "values": "_compare_values"}
+    """Comparison methods for each kind of series in the schema."""
+
+    def __init__(self, old, new, start_year, end_year):
+        if end_year < start_year:
+            raise ValueError("Appraisal must cover at least one year.")
+        self.start_year = start_year
+        self.end_year = end_year
+        self.changes = {}
+        for name, spec in sorted(SCHEMA.items()):
+            compare = getattr(self, self.COMPARATORS[spec.kind])
+            year = compare(old.series(name), new.series(name))
+            if year is not None and year <= end_year:
+                self.changes[name] = max(year, start_year)
+        years = [self.changes[name] for name in ("discount_rate",
+                                                 "gdp_growth")
+                 if name in self.changes]
+        self.first_year = min(years) if years else None
+        self.old_factors = FactorTable(old.discount, old.deflator,
+                                       start_year, end_year)
+        self.new_factors = self.old_factors
+        if self.first_year is not None:
+            self.new_factors = self.old_factors.recompute(
+                new.discount, new.deflator, self.first_year
+            )
+
+    @staticmethod
+    def _compare_discount(old, new):
+        """The first year in which the discount factors differ."""
+        if (old.base_year, old.year_zero) != (new.base_year, new.year_zero):
+            return float("-inf")
+        year = old.first_rate_difference(new)
+        if year is None:
+            return None
+        return max(old.year_zero + year, old.base_year + 1)
+
+    @staticmethod
+    def _compare_growth(old, new):
+        """The first year in which the GDP deflator factors differ.
+
+        A change to a rate after the base year affects the following
+        years, but a change before the base year affects every year up
+        to it, so then every year is treated as affected.
+
+        """
+        if old.base_year != new.base_year:
+            return float("-inf")
+        year = old.first_rate_difference(new)
+        if year is None:
+            return None
+        if year < 0:
+            return float("-inf")
+        return old.base_year + year + 1
+
+    @staticmethod
+    def _compare_values(old, new):
+        """The first year in which the annual values differ."""
+        if old is None or new is None:
+            return None if old is new else float("-inf")
+        old_items, new_items = list(old.items()), list(new.items())
+        for (old_year, old_value), (new_year, new_value) in zip(old_items,
+                                                                new_items):
+            if old_year != new_year:
+                return min(old_year, new_year)
+            if old_value != new_value:
+                return old_year
+        if len(old_items) != len(new_items):
+            return max(old_items, new_items, key=len)[min(
+                len(old_items), len(new_items))][0]
+        return None
+
+    def report(self, schemes, type_=Cost.PRESENT_VALUE):
+        """The change in each scheme's total cost under the new release.
+
+        Only the costs incurred from :py:attr:`first_year` onwards are
+        converted, with both the old and the new factors.
+
+        Arguments:
+          schemes (``dict``): The cost records of each scheme, as
+            ``(value, type_, year, adjustment_factor)``, keyed by
+            scheme name.
+          type_ (``int``, optional): The type to convert costs to.
+            Defaults to :py:attr:`~.Cost.PRESENT_VALUE`.
+
+        Returns:
+          ``dict``: A :py:class:`SchemeDelta` for each scheme.
+
+        Raises:
+          ValueError: If any record's year is outside the appraisal
+            period, or any type is invalid.
+
+        """
+        out = {}
+        for name, records in schemes.items():
+            records = list(records)
+            for record in records:
+                if not self.start_year <= record[2] <= self.end_year:
+                    raise ValueError(
+                        "Year outside appraisal: {!r}.".format(record[2])
+                    )
+            affected = []
+            if self.first_year is not None:
+                affected = [record for record in records
+                            if record[2] >= self.first_year]
+            delta = ExactSum(self._convert(affected, type_,
+                                           self.new_factors))
+            delta.update(-value for value in
+                         self._convert(affected, type_, self.old_factors))
+            out[name] = SchemeDelta(len(records), len(affected),
+                                    float(delta))
+        return out
+
+    @staticmethod
+    def _convert(records, type_, table):
+        """Convert cost records to ``type_`` using a factor table."""
+        factors = {year: table.factors(year)
+                   for year in {record[2] for record in records}}
+        return convert_records(records, type_, factors)
@@ -0,0 +1,92 @@
+"""Hot-swappable holder for the active :py:class:`~.WebTagData`.
+
+Long-running services should read :py:attr:`WebTagHolder.data` once
+per request and use that snapshot throughout; a concurrent swap
+replaces the holder's reference but never mutates the snapshot, so
+in-flight requests remain consistent.
+
+"""
+import logging
+import threading
+
+from .webtag_data import WebTagData
+
+
+logger = logging.getLogger(__name__)
+
+
+class WebTagHolder:
+    """Holds the active :py:class:`~.WebTagData` and replaces it atomically.
+
+    Arguments:
+      data (:py:class:`~.WebTagData`, optional): The initially active
+        data. Defaults to ``None``.
+
+    """
+
+    def __init__(self, data=None):
+        self._data = data
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        """The currently active data.
+
+        Returns:
+          :py:class:`~.WebTagData` or ``None``: The active snapshot
+            (read-only).
+
+        """
+        return self._data
+
+    def swap(self, data, force=False):
+        """Replace the active data if ``data`` is a newer release.
+
+        Arguments:
+          data (:py:class:`~.WebTagData`): The candidate data.
+          force (``bool``, optional): Whether to replace the active
+            data regardless of release date. Defaults to ``False``.
+
+        Returns:
+          bool: Whether the active data was replaced.
+
+        """
+        with self._lock:
+            current = self._data
+            if (not force and current is not None and
+                    data.released <= current.released):
+                return False
+            self._data = data
+        logger.info("Active WebTAG data is now %r (released %s)",
+                    data.version, data.released)
+        return True
+
+    def refresh(self, dir_):
+        """Load the latest data in ``dir_`` and swap it in if newer.
+
+        Arguments:
+          dir_ (``str``): The directory to search.
+
+        Returns:
+          bool: Whether the active data was replaced.
+
+        """
+        data = WebTagData.from_latest_json(dir_)
+        return data is not None and self.swap(data)
+
+    async def refresh_async(self, dir_, executor=None):
+        """Asynchronous version of :py:meth:`refresh`.
+
+        Arguments:
+          dir_ (``str``): The directory to search.
+          executor (``concurrent.futures.Executor``, optional): The
+            executor to load in. Defaults to the loop's default
+            executor.
+
+        Returns:
+          bool: Whether the active data was replaced.
+
+        """
+        data = await WebTagData.from_latest_json_async(dir_,
+                                                       executor=executor)
+        return data is not None and self.swap(data)
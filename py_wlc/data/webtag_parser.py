@@ -1,18 +1,24 @@
-#! /usr/bin/env python
 """WebTAG Parser - functionality for extracting from the Data Book.
 
 This class parses the databook to a more convenient JSON format for
-use by :py:class:`~.WebTagData`.
+use by :py:class:`~.WebTagData`. The command line interface is
+installed as ``webtag_parser``, and can also be run as
+``python -m py_wlc.data``.
 
 """
 import argparse
 import datetime
+import gzip
 import json
+import os
 from os import path
-from sys import argv, stdout
+import sys
+import tempfile
 
 import xlrd
 
+from .webtag_schema import LOCATIONS
+
 
 class WebTagParser:
     """Class to handle access to a WebTAG Databook Excel file.
@@ -23,15 +29,33 @@ class WebTagParser:
     avoid loading all worksheets at once. :py:meth:`extract_data` will
     load and unload the appropriate worksheets as required.
 
+    Only the cells needed are read from each worksheet: labels are
+    searched for cell by cell, stopping at the first match, and values
+    are only read from a data series' start row up to its first empty
+    key.
+
+    Opening a workbook only checks that it is a Databook and reads its
+    :py:attr:`version`; the :py:attr:`date` and :py:attr:`base_year`
+    are extracted when first accessed. :py:meth:`probe` provides a
+    quick check of a file, without extracting anything else.
+
     Arguments:
-      filename (``str``): The WebTAG Databook file to open.
+      filename (``str``, ``bytes`` or file-like): The WebTAG Databook
+        file to open, or its contents (as ``bytes`` or an object with
+        a ``read`` method), so that it need not be saved to disk.
+      book (``xlrd.Book``, optional): An already-open workbook to use
+        instead of opening ``filename``, which is then only used for
+        the ``source`` metadata. Defaults to ``None``.
 
     Attributes:
       book (``xlrd.Workbook``): The Excel workbook.
-      date (``datetime.datetime``): The release date of the databook.
-      filename (``str``): The name of the file to open.
+      filename (``str`` or ``None``): The name of the file opened (for
+        file-like objects, their ``name``, if any).
       version (``str``): The version of the databook.
 
+    Raises:
+      IOError: If the file is not a WebTAG Databook.
+
     """
 
     BASE = ("User Parameters", 0, 11, "Price year")
@@ -43,22 +67,28 @@ class WebTagParser:
     DATE = ("Audit", 0, 2)
     """Where to locate the workbook date."""
 
-    LOCATIONS = {"discount_rate": ("A1.1.1", 24, 1, 3),
-                 "rail_diesel_price": ("A1.3.7", 27, 1, 5),
-                 "rail_electricity_price": ("A1.3.7", 27, 1, 7),
-                 "rail_fuel_duty": ("A1.3.7", 27, 1, 10),
-                 "gdp_growth": ("Annual Parameters", 30, 1, 5)}
-    """Locations of defined data series for extraction."""
+    LOCATIONS = LOCATIONS
+    """Locations of defined data series for extraction (see
+    :py:mod:`~.webtag_schema`)."""
 
     VERSION = ("Cover", 3, 0)
     """Where to locate the workbook version."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, book=None):
+        contents = None
+        if isinstance(filename, (bytes, bytearray)):
+            contents, filename = filename, None
+        elif hasattr(filename, "read"):
+            contents, filename = filename.read(), getattr(filename, "name",
+                                                          None)
         self.filename = filename
         sht, row, col, val = self.CHECK
         err_msg = "Not a WebTAG Databook."
         try:
-            self.book = xlrd.open_workbook(filename, on_demand=True)
+            if book is None:
+                book = xlrd.open_workbook(filename, file_contents=contents,
+                                          on_demand=True)
+            self.book = book
             sheet = self.book.sheet_by_name(sht)
         except xlrd.XLRDError:
             raise IOError(err_msg)
@@ -69,8 +99,50 @@ class WebTagParser:
         if compare != val:
             raise IOError(err_msg)
         self.version = self._extract_version(*self.VERSION)
-        self.date = self._extract_date(*self.DATE)
-        self.base_year = self._extract_base_year(*self.BASE)
+        self._date = None
+        self._base_year = None
+
+    @property
+    def base_year(self):
+        """The price base year of the data, extracted on first access.
+
+        Returns:
+          ``int``: The base year.
+
+        """
+        if self._base_year is None:
+            self._base_year = self._extract_base_year(*self.BASE)
+        return self._base_year
+
+    @property
+    def date(self):
+        """The release date of the databook, extracted on first access.
+
+        Returns:
+          ``datetime.date``: The release date.
+
+        """
+        if self._date is None:
+            self._date = self._extract_date(*self.DATE)
+        return self._date
+
+    @classmethod
+    def probe(cls, filename):
+        """Check that a file is a WebTAG Databook and read its version.
+
+        Arguments:
+          filename (``str``, ``bytes`` or file-like): The file to check,
+            as for :py:class:`WebTagParser`.
+
+        Returns:
+          ``str``: The version of the databook.
+
+        Raises:
+          IOError: If the file is not a WebTAG Databook.
+
+        """
+        with cls(filename) as parser:
+            return parser.version
 
     def _extract_base_year(self, sheet_name, label_col, base_col, label):
         """Extract the base year from the appropriate worksheet.
@@ -88,8 +160,8 @@ class WebTagParser:
 
         """
         sheet = self.book.sheet_by_name(sheet_name)
-        base_row = sheet.col_values(label_col).index(label)
-        base = sheet.col_values(base_col)[base_row]
+        base = sheet.cell_value(self._find_row(sheet, label_col, label),
+                                base_col)
         self.book.unload_sheet(sheet_name)
         return int(base)
 
@@ -112,8 +184,8 @@ class WebTagParser:
 
         """
         sheet = self.book.sheet_by_name(sheet_name)
-        date_row = sheet.col_values(version_col).index(self.version)
-        date = xlrd.xldate_as_tuple(sheet.col_values(date_col)[date_row],
+        date_row = self._find_row(sheet, version_col, self.version)
+        date = xlrd.xldate_as_tuple(sheet.cell_value(date_row, date_col),
                                     self.book.datemode)
         self.book.unload_sheet(sheet_name)
         return datetime.date(*date[:3])
@@ -137,6 +209,74 @@ class WebTagParser:
         self.book.unload_sheet(sheet_name)
         return version
 
+    @staticmethod
+    def _find_row(sheet, col, value):
+        """Find the first row in which a column holds the given value.
+
+        Arguments:
+          sheet (``xlrd.sheet.Sheet``): The worksheet to search.
+          col (``int``): The column to search.
+          value: The value to find.
+
+        Returns:
+          ``int``: The index of the row.
+
+        Raises:
+          ValueError: If the value is not in the column.
+
+        """
+        cell_value = sheet.cell_value
+        for row in range(sheet.nrows):
+            if cell_value(row, col) == value:
+                return row
+        raise ValueError("{!r} is not in column {}".format(value, col))
+
+    def _snapshot(self, sheet_name, locations):
+        """Read several series from one worksheet, loading it once.
+
+        Each key column is read a cell at a time from its start row,
+        stopping at the first empty key, once for all of the series
+        sharing it. Each value column is only read as far as the last
+        key. Assumes that cell ``A3`` contains the worksheet title and
+        that cell ``A4`` contains the table name.
+
+        Arguments:
+          sheet_name (``str``): The name of the worksheet.
+          locations (iterable of ``tuple``): The ``start_row``,
+            ``key_col`` and ``value_col`` of each series.
+
+        Returns:
+          ``dict``: The extracted data, keyed by location.
+
+        """
+        sheet = self.book.sheet_by_name(sheet_name)
+        title, table = sheet.cell_value(2, 0), sheet.cell_value(3, 0)
+        key_columns = {}
+        snapshot = {}
+        for location in locations:
+            start_row, key_col, value_col = location
+            keys = key_columns.get((start_row, key_col))
+            if keys is None:
+                keys = []
+                for row in range(start_row, sheet.nrows):
+                    key = sheet.cell_value(row, key_col)
+                    if key == "":
+                        break
+                    keys.append(key)
+                try:
+                    keys = list(map(int, keys))
+                except ValueError:
+                    pass
+                key_columns[start_row, key_col] = keys
+            values = sheet.col_values(value_col, start_row,
+                                      start_row + len(keys))
+            data = dict(zip(keys, values))
+            data["title"] = title
+            data["table"] = table
+            snapshot[location] = data
+        self.book.unload_sheet(sheet_name)
+        return snapshot
+
     def __enter__(self):
         return self
 
@@ -159,24 +299,55 @@ class WebTagParser:
           dict: The data extracted from the :py:attr:`book`.
 
         """
-        data = {}
-        for name in self.LOCATIONS:
+        return dict(self.iter_extract(verbose))
+
+    def iter_extract(self, verbose=False):
+        """Lazily extract all data from ``LOCATIONS`` and metadata.
+
+        Each worksheet is read once, in a single snapshot of every
+        series on it, when its first series is requested; the snapshot
+        is dropped once its last series has been yielded, so each
+        worksheet's data can be written out before the next is read.
+
+        Arguments:
+          verbose (``bool``, optional): Whether to report progress.
+            Defaults to ``False``.
+
+        Yields:
+          ``tuple``: The name and data of each item, in the same order
+            as :py:meth:`extract_all`.
+
+        """
+        sheets = {}
+        for sheet_name, *location in self.LOCATIONS.values():
+            sheets.setdefault(sheet_name, []).append(tuple(location))
+        snapshots = {}
+        for name, (sheet_name, *location) in self.LOCATIONS.items():
             if verbose:
                 print("Extracting {}".format(name))
-            data[name] = self.extract_named_data(name)
+            if sheet_name not in snapshots:
+                snapshots[sheet_name] = self._snapshot(sheet_name,
+                                                       sheets[sheet_name])
+            locations = sheets[sheet_name]
+            locations.remove(tuple(location))
+            data = snapshots[sheet_name][tuple(location)]
+            if not locations:
+                del snapshots[sheet_name]
+            yield name, data
         if verbose:
             print("Extracting metadata")
-        data["source"] = path.split(self.filename)[-1]
-        data["released"] = str(self.date)
-        data["version"] = self.version
-        data["base_year"] = self.base_year
-        return data
+        yield "source", (path.split(self.filename)[-1]
+                         if self.filename is not None else None)
+        yield "released", str(self.date)
+        yield "version", self.version
+        yield "base_year", self.base_year
 
     def extract_data(self, sheet_name, start_row, key_col, value_col):
         """Extract data from the specified worksheet.
 
         Assumes that cell ``A3`` contains the worksheet title and that
-        cell ``A4`` contains the table name.
+        cell ``A4`` contains the table name. The data runs from the
+        ``start_row`` to the first row with an empty key.
 
         Arguments:
           sheet_name (``str``): The name of the worksheet.
@@ -188,17 +359,8 @@ class WebTagParser:
           dict: The extracted data
 
         """
-        sheet = self.book.sheet_by_name(sheet_name)
-        labels = sheet.col_values(key_col)[start_row:]
-        values = sheet.col_values(value_col)[start_row:]
-        try:
-            data = {int(k): v for k, v in zip(labels, values) if k}
-        except ValueError:
-            data = {k: v for k, v in zip(labels, values) if k}
-        self.book.unload_sheet(sheet_name)
-        data["title"] = sheet.cell(2, 0).value
-        data["table"] = sheet.cell(3, 0).value
-        return data
+        location = (start_row, key_col, value_col)
+        return self._snapshot(sheet_name, [location])[location]
 
     def extract_named_data(self, name):
         """Extract a named data series from ``LOCATIONS``.
@@ -217,6 +379,42 @@ class WebTagParser:
         return self.extract_data(*self.LOCATIONS[name])
 
 
+def write_json(items, file, indent=4):
+    """Write key-value pairs to a file as a JSON object, incrementally.
+
+    Each value is serialised and written as soon as it is produced, so
+    only one value is held in memory at a time. The output is the same
+    as ``json.dump(dict(items), file, indent=indent)`` or, for compact
+    output, with ``separators=(",", ":")``.
+
+    Arguments:
+      items (iterable of ``tuple``): The keys and values to write.
+      file: The (text) file to write to.
+      indent (``int`` or ``None``, optional): The indentation to use,
+        or ``None`` for compact output. Defaults to ``4``.
+
+    """
+    if indent is None:
+        separator, item_separator, newline = ":", ",", ""
+    else:
+        separator, item_separator = ": ", ","
+        newline = "\n" + " " * indent
+    file.write("{")
+    first = True
+    for key, value in items:
+        if not first:
+            file.write(item_separator)
+        first = False
+        if indent is None:
+            value = json.dumps(value, separators=(",", ":"))
+        else:
+            value = json.dumps(value, indent=indent).replace("\n", newline)
+        file.write(newline + json.dumps(str(key)) + separator + value)
+    if not first and indent is not None:
+        file.write("\n")
+    file.write("}")
+
+
 def parse_args(args):
     """Parse the arguments for :py:func:`cli`.
 
@@ -241,6 +439,13 @@ def parse_args(args):
     group1.add_argument("-v", "--verbose",
                         action="store_true",
                         help="increase output verbosity")
+    group2 = arg_parser.add_argument_group("Output format")
+    group2.add_argument("-c", "--compact",
+                        action="store_true",
+                        help="write minified JSON")
+    group2.add_argument("-z", "--gzip",
+                        action="store_true",
+                        help="compress the output with gzip")
     args_ = arg_parser.parse_args(args)
     if args_.o is None and args_.verbose:
         msg = "-v cannot be used without -o"
@@ -248,11 +453,36 @@ def parse_args(args):
     return args_
 
 
+def _output_mode(file):
+    """The permissions to give a new output file.
+
+    Matches what opening the file for writing would give: the existing
+    file's mode, or the default mode under the current umask.
+
+    Arguments:
+      file (``str``): The output file.
+
+    Returns:
+      ``int``: The permission bits.
+
+    """
+    try:
+        return os.stat(file).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 def cli(args):
     """Provide a CLI for the :py:class:`~.WebTagParser`.
 
     Will either output to a specified file (with optional verbose
-    reporting) or dump the JSON data to ``stdout``.
+    reporting) or write the JSON data to ``stdout``. Each series is
+    written as soon as it is extracted, optionally as compact JSON
+    and/or compressed with gzip. An output file is written to a
+    temporary file alongside it and only replaced once extraction has
+    succeeded, so a failure leaves any existing file untouched.
 
     Arguments:
       args (``argparse.Namespace``): The parsed command line arguments.
@@ -261,23 +491,66 @@ def cli(args):
       ValueError: If ``-v`` is supplied without ``-o``.
 
     """
-    print(args.file, args.o, args.verbose)
     if args.o is None and args.verbose:
         raise ValueError("Verbose mode not supported unless output file set.")
+    indent = None if args.compact else 4
     if args.verbose:
         print("Reading from input file {}".format(args.file))
     with WebTagParser(args.file) as parser:
-        data = parser.extract_all(args.verbose)
-        if args.verbose:
-            print("Data extracted from input file")
-    if args.o is not None:
-        with open(args.o, "w") as outfile:
+        if args.o is None:
+            if args.gzip:
+                outfile = gzip.open(sys.stdout.buffer, "wt",
+                                    encoding="utf-8")
+            else:
+                outfile = sys.stdout
+            try:
+                write_json(parser.iter_extract(args.verbose), outfile,
+                           indent)
+            finally:
+                if outfile is not sys.stdout:
+                    outfile.close()
+        else:
             if args.verbose:
                 print("Writing to output file {}".format(args.o))
-            json.dump(data, outfile, indent=4)
-    else:
-        stdout.write(json.dumps(data, indent=4))
+            handle, temp = tempfile.mkstemp(
+                suffix=".tmp", dir=path.dirname(path.abspath(args.o))
+            )
+            os.close(handle)
+            try:
+                if args.gzip:
+                    outfile = gzip.open(temp, "wt", encoding="utf-8")
+                else:
+                    outfile = open(temp, "w")
+                with outfile:
+                    write_json(parser.iter_extract(args.verbose), outfile,
+                               indent)
+                os.chmod(temp, _output_mode(args.o))
+                os.replace(temp, args.o)
+            except BaseException:
+                os.remove(temp)
+                raise
+        if args.verbose:
+            print("Data extracted from input file")
+
+
+def main(argv=None):
+    """Entry point for the ``webtag_parser`` console script.
+
+    Arguments:
+      argv (``list`` of ``str``, optional): The command line arguments.
+        Defaults to ``sys.argv[1:]``.
+
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        cli(parse_args(argv))
+    except BrokenPipeError:
+        # The reader closed the pipe early (e.g. ``| head``); silence the
+        # error Python would otherwise raise when flushing at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    cli(parse_args(argv[1:]))
+    main()
@@ -0,0 +1,62 @@
+"""Declarative schema of the data series available from WebTAG.
+
+Each series is declared once, with both its location in the Databook
+(used by :py:class:`~.WebTagParser`) and the kind of object it is
+exposed as (used by :py:class:`~.WebTagData`). New series only need to
+be added here, or via :py:func:`register_series`.
+
+The available kinds are:
+
+  * ``"discount"``: a :py:class:`~.Discount`, from rates keyed by
+    year ranges (e.g. ``"0-30"``);
+  * ``"growth"``: a :py:class:`~.GdpDeflator`, from annual growth
+    rates; and
+  * ``"values"``: a :py:class:`~.ValueSeries`, from annual values.
+
+"""
+from collections import namedtuple
+
+
+SeriesSpec = namedtuple("SeriesSpec", ["sheet_name", "start_row",
+                                       "key_col", "value_col", "kind"])
+"""The location and kind of a WebTAG data series."""
+
+KINDS = ("discount", "growth", "values")
+"""The kinds of series that can be declared."""
+
+SCHEMA = {}
+"""The declared series, keyed by name."""
+
+LOCATIONS = {}
+"""The Databook location of each declared series, keyed by name."""
+
+
+def register_series(name, sheet_name, start_row, key_col, value_col,
+                    kind="values"):
+    """Declare a WebTAG data series.
+
+    Arguments:
+      name (``str``): The name of the series.
+      sheet_name (``str``): The worksheet containing the series.
+      start_row (``int``): The first row of the series.
+      key_col (``int``): The column containing the keys.
+      value_col (``int``): The column containing the values.
+      kind (``str``, optional): The kind of series (must be in
+        :py:data:`KINDS`). Defaults to ``"values"``.
+
+    Raises:
+      ValueError: If ``kind`` is not in :py:data:`KINDS`.
+
+    """
+    if kind not in KINDS:
+        raise ValueError("Not a valid kind: {!r}.".format(kind))
+    spec = SeriesSpec(sheet_name, start_row, key_col, value_col, kind)
+    SCHEMA[name] = spec
+    LOCATIONS[name] = spec[:4]
+
+
+register_series("discount_rate", "A1.1.1", 24, 1, 3, "discount")
+register_series("rail_diesel_price", "A1.3.7", 27, 1, 5)
+register_series("rail_electricity_price", "A1.3.7", 27, 1, 7)
+register_series("rail_fuel_duty", "A1.3.7", 27, 1, 10)
+register_series("gdp_growth", "Annual Parameters", 30, 1, 5, "growth")
@@ -0,0 +1,308 @@
+"""Watches a directory for new WebTAG releases and reloads incrementally.
+
+Rather than rescanning and reparsing every file, as
+:py:meth:`~.WebTagData.from_latest_json` does, the
+:py:class:`WebTagWatcher` remembers the size and modification time of
+each file it has already seen and only parses files that are new or
+have changed. On Linux, ``inotify`` is used to wake the watcher as soon
+as the directory changes; elsewhere it falls back to polling.
+
+"""
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import threading
+import time
+from os import path, walk
+
+from .webtag_data import WebTagData, digest
+
+
+logger = logging.getLogger(__name__)
+
+
+class _PollWaiter:
+    """Waits for a fixed interval between directory scans."""
+
+    def __init__(self, stop):
+        self._stop = stop
+
+    def add(self, dir_):
+        """Polling needs no per-directory set-up."""
+        pass
+
+    def wait(self, timeout):
+        """Sleep for ``timeout`` seconds, or until stopped."""
+        self._stop.wait(timeout)
+
+    def close(self):
+        """Polling holds no resources."""
+        pass
+
+
+class _InotifyWaiter:
+    """Waits for ``inotify`` events, up to a maximum interval.
+
+    Raises:
+      OSError: If ``inotify`` is not available on this platform.
+
+    """
+
+    EVENTS = 0x2 | 0x8 | 0x80 | 0x100 | 0x200
+    """``IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE``."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"),
+                                 use_errno=True)
+        try:
+            init = self._libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify is not available")
+        self._fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched = set()
+
+    def add(self, dir_):
+        """Add a watch on ``dir_``, if not already watched."""
+        if dir_ in self._watched:
+            return
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(dir_),
+                                        self.EVENTS) >= 0:
+            self._watched.add(dir_)
+
+    def wait(self, timeout):
+        """Wait up to ``timeout`` seconds for events, then drain them."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        """Close the ``inotify`` file descriptor."""
+        os.close(self._fd)
+
+
+class WebTagWatcher:
+    """Publishes newer :py:class:`~.WebTagData` releases as they appear.
+
+    A new or changed file is only parsed once its size and modification
+    time have been stable for ``settle`` seconds, so that partially
+    written output (e.g. from the :py:func:`~.webtag_parser.cli`) is
+    not picked up. Subscribers are called with each newly published
+    :py:class:`~.WebTagData`; :py:meth:`~.WebTagHolder.swap` is a
+    suitable subscriber.
+
+    Arguments:
+      dir_ (``str``): The directory to watch.
+      data (:py:class:`~.WebTagData`, optional): The currently active
+        data; only strictly newer releases are published. Defaults to
+        ``None``.
+      interval (``float``, optional): The maximum time between scans,
+        in seconds. Defaults to ``1.0``.
+      settle (``float``, optional): The time a changed file must be
+        stable for before it is parsed, in seconds. Defaults to
+        ``1.0``.
+      use_inotify (``bool``, optional): Whether to use ``inotify``
+        where available. Defaults to ``True``.
+
+    Attributes:
+      data (:py:class:`~.WebTagData` or ``None``): The most recently
+        published data.
+
+    """
+
+    def __init__(self, dir_, data=None, interval=1.0, settle=1.0,
+                 use_inotify=True):
+        self.dir_ = dir_
+        self.data = data
+        self.interval = interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self._seen = {}
+        self._failed = {}
+        self._pending = {}
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call ``callback`` with each newly published release.
+
+        Arguments:
+          callback (``callable``): The subscriber to add.
+
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling ``callback`` with new releases.
+
+        Arguments:
+          callback (``callable``): The subscriber to remove.
+
+        Raises:
+          ValueError: If ``callback`` is not subscribed.
+
+        """
+        self._subscribers.remove(callback)
+
+    def poll(self, waiter=None):
+        """Scan the directory once, publishing any newer release.
+
+        Arguments:
+          waiter (optional): An object with an ``add`` method to
+            register each directory scanned with. Used internally by
+            :py:meth:`start`.
+
+        Returns:
+          :py:class:`~.WebTagData` or ``None``: The newly published
+            data, if any.
+
+        """
+        now = time.monotonic()
+        latest = latest_digest = None
+        found = set()
+        parsed = {}
+        for curr_dir, _, files in walk(self.dir_):
+            if waiter is not None:
+                waiter.add(curr_dir)
+            for file in files:
+                file = path.join(curr_dir, file)
+                found.add(file)
+                checked = self._check(file, now)
+                if checked is None:
+                    continue
+                parsed[file], data, digest_ = checked
+                if self._is_newer(data, latest):
+                    latest, latest_digest = data, digest_
+        for files in (self._seen, self._failed, self._pending):
+            for removed in set(files).difference(found):
+                del files[removed]
+        if latest is None or not self._is_newer(latest, self.data):
+            self._seen.update(parsed)
+            return None
+        self.data = WebTagData.shared(latest, digest=latest_digest)
+        logger.info("New WebTAG release found: %r", self.data.version)
+        for callback in list(self._subscribers):
+            try:
+                callback(self.data)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("WebTAG subscriber %r failed", callback)
+        self._seen.update(parsed)
+        return self.data
+
+    def start(self):
+        """Start watching in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, if running."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _check(self, file, now):
+        """Parse ``file`` if it is new or changed, and has settled.
+
+        Files that could not be parsed as WebTAG JSON are remembered,
+        and only parsed again once they change.
+
+        Arguments:
+          file (``str``): The file to check.
+          now (``float``): The time of the current scan.
+
+        Returns:
+          ``tuple`` or ``None``: The file's signature, parsed data and
+            content digest, if the file was parsed and is valid WebTAG
+            JSON.
+
+        """
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature in (self._seen.get(file), self._failed.get(file)):
+            return None
+        pending = self._pending.get(file)
+        if pending is None or pending[0] != signature:
+            self._pending[file] = pending = (signature, now)
+        if now - pending[1] < self.settle:
+            return None
+        del self._pending[file]
+        try:
+            with open(file, "rb") as file_:
+                content = file_.read()
+            data = json.loads(content.decode("utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or "released" not in data:
+            self._failed[file] = signature
+            return None
+        self._failed.pop(file, None)
+        return signature, data, digest(content)
+
+    @staticmethod
+    def _is_newer(data, other):
+        """Whether ``data`` was released after ``other``.
+
+        Arguments:
+          data (``dict``): Parsed WebTAG JSON data.
+          other (``dict`` or :py:class:`~.WebTagData` or ``None``): The
+            data to compare against.
+
+        Returns:
+          bool: Whether ``data`` is the newer release.
+
+        """
+        if other is None:
+            return True
+        if isinstance(other, WebTagData):
+            return data["released"] > str(other.released)
+        return data["released"] > other["released"]
+
+    def _run(self):
+        """Scan repeatedly until :py:meth:`stop` is called."""
+        waiter = None
+        if self.use_inotify:
+            try:
+                waiter = _InotifyWaiter()
+            except OSError:
+                logger.info("inotify unavailable, falling back to polling")
+        if waiter is None:
+            waiter = _PollWaiter(self._stop)
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll(waiter)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Failed to reload WebTAG data")
+                waiter.wait(self._next_timeout())
+        finally:
+            waiter.close()
+
+    def _next_timeout(self):
+        """Time to wait before the next scan, allowing for settling."""
+        if self._pending:
+            return min(self.interval, self.settle)
+        return self.interval
@@ -1,6 +1,10 @@
 """The :py:mod:`~.economics` module provides core economic models."""
 
 from .discount import Discount
-from .gdp_deflator import GdpDeflator
-from .residual_value import ResidualValueCalculator
+from .gdp_deflator import GdpDeflator, RebasedLedger
+from .residual_value import (Annuity, DecliningBalance, DepreciationMethod,
+                             ResidualValueCalculator)
 from .cost import Cost
+from .factors import FactorTable
+from .renewal import RenewalCycle
+from .runner import AppraisalResult, AppraisalRunner
@@ -1,6 +1,8 @@
 """Representation of cost objects in various bases and forms."""
 from functools import total_ordering
 
+from ..utils import instrumentation
+
 
 @total_ordering
 class Cost:
@@ -72,21 +74,37 @@ class Cost:
     PRESENT_VALUE = 16
     """Discounted real costs."""
 
+    TYPES = (NOMINAL | FACTOR_COST, NOMINAL | MARKET_PRICE,
+             REAL | FACTOR_COST, REAL | MARKET_PRICE,
+             PRESENT_VALUE | FACTOR_COST, PRESENT_VALUE | MARKET_PRICE)
+    """Every distinct basis a cost can be converted to."""
+
+    TYPE_MASK = 31
+    """Mask covering every type flag; other bits are ignored."""
+
+    TYPE_TABLE = ()
+    """Validity and conversion exponents for every possible type.
+
+    Indexed by ``type_ & TYPE_MASK``, each entry is a tuple of the
+    error message (``None`` for valid types) and the exponents of the
+    discount, deflation and adjustment factors in the multiplier that
+    converts a nominal factor cost to that type.
+    """
+
     def __init__(self, value, type_, year, discount,
                  deflator, adjustment_factor):
-        self.validate_type(type_)
+        if instrumentation.ENABLED:
+            instrumentation.count(__name__, "cost_init")
+        error, disc, defl, adj = self.TYPE_TABLE[type_ & self.TYPE_MASK]
+        if error is not None:
+            raise ValueError(error)
         self.year = year
         self.discount_factor = discount[year]
         self.deflation_factor = 1 / deflator[year]
         self.adjustment_factor = adjustment_factor
-        if type_ & self.PRESENT_VALUE:
-            value /= self.discount_factor
-            type_ |= self.REAL
-        if type_ & self.REAL:
-            value /= self.deflation_factor
-        if type_ & self.MARKET_PRICE:
-            value /= self.adjustment_factor
-        self.value = value
+        self.value = value / (self.discount_factor ** disc *
+                              self.deflation_factor ** defl *
+                              adjustment_factor ** adj)
         self.hash_ = None
 
     def __eq__(self, other):
@@ -122,16 +140,55 @@ class Cost:
           float: The converted value.
 
         """
-        self.validate_type(type_)
-        value = self.value
-        if type_ & self.PRESENT_VALUE:
-            value *= self.discount_factor
-            type_ |= self.REAL
-        if type_ & self.REAL:
-            value *= self.deflation_factor
-        if type_ & self.MARKET_PRICE:
-            value *= self.adjustment_factor
-        return value
+        error, disc, defl, adj = self.TYPE_TABLE[type_ & self.TYPE_MASK]
+        if error is not None:
+            raise ValueError(error)
+        return self.value * (self.discount_factor ** disc *
+                             self.deflation_factor ** defl *
+                             self.adjustment_factor ** adj)
+
+    @classmethod
+    def conversion_matrix(cls, costs, types=None):
+        """Convert a batch of costs to several types at once.
+
+        Each ``type_`` is validated once for the whole batch, and the
+        combined discount, deflation and adjustment multiplier for every
+        type is calculated once for each distinct set of factors (i.e.
+        once per year for costs sharing the same factor series and
+        adjustment factor), rather than once per call to
+        :py:meth:`as_type`. The multipliers are formed exactly as in
+        :py:meth:`as_type`, so the results are identical.
+
+        Arguments:
+          costs (iterable of :py:class:`Cost`): The costs to convert.
+          types (``tuple`` of ``int``, optional): The types to convert
+            to. Defaults to :py:attr:`TYPES`.
+
+        Returns:
+          ``list`` of ``list`` of ``float``: One row per cost, with one
+            column per type.
+
+        Raises:
+          ValueError: If any of the ``types`` is invalid.
+
+        """
+        if types is None:
+            types = cls.TYPES
+        for type_ in types:
+            cls.validate_type(type_)
+        entries = [cls.TYPE_TABLE[type_ & cls.TYPE_MASK] for type_ in types]
+        multipliers = {}
+        rows = []
+        for cost in costs:
+            key = (cost.discount_factor, cost.deflation_factor,
+                   cost.adjustment_factor)
+            if key not in multipliers:
+                multipliers[key] = [key[0] ** disc * key[1] ** defl *
+                                    key[2] ** adj
+                                    for _, disc, defl, adj in entries]
+            value = cost.value
+            rows.append([value * mult for mult in multipliers[key]])
+        return rows
 
     @classmethod
     def validate_type(cls, type_):
@@ -147,10 +204,35 @@ class Cost:
         Raises:
           ValueError: If the ``type_`` is invalid.
 
+        """
+        error = cls.TYPE_TABLE[type_ & cls.TYPE_MASK][0]
+        if error is not None:
+            raise ValueError(error)
+
+    @classmethod
+    def _type_entry(cls, type_):
+        """Calculate the :py:attr:`TYPE_TABLE` entry for a type.
+
+        Arguments:
+          type_ (``int``): The type of the cost.
+
+        Returns:
+          ``tuple``: The error message (or ``None``) and the discount,
+            deflation and adjustment exponents.
+
         """
         if (type_ & cls.MARKET_PRICE) and (type_ & cls.FACTOR_COST):
-            raise ValueError("Cost cannot be market price and factor cost.")
+            return "Cost cannot be market price and factor cost.", 0, 0, 0
         if (type_ & cls.NOMINAL) and (type_ & cls.REAL):
-            raise ValueError("Cost cannot be real and nominal.")
+            return "Cost cannot be real and nominal.", 0, 0, 0
         if (type_ & cls.NOMINAL) and (type_ & cls.PRESENT_VALUE):
-            raise ValueError("Nominal costs cannot be present values.")
+            return "Nominal costs cannot be present values.", 0, 0, 0
+        discounted = 1 if type_ & cls.PRESENT_VALUE else 0
+        real = 1 if type_ & (cls.REAL | cls.PRESENT_VALUE) else 0
+        market = 1 if type_ & cls.MARKET_PRICE else 0
+        return None, discounted, real, market
+
+
+# pylint: disable=protected-access
+Cost.TYPE_TABLE = tuple(Cost._type_entry(type_)
+                        for type_ in range(Cost.TYPE_MASK + 1))
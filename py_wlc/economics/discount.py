@@ -1,6 +1,7 @@
 """:py:mod:`~.discount` enables the calculation of Present Value."""
+import threading
 
-from ..generic import ExtendedDict, IndexSeries
+from ..generic import IndexSeries, RateBands
 
 
 class Discount(IndexSeries):
@@ -15,15 +16,33 @@ class Discount(IndexSeries):
     year in the rates dictionary, is assumed to be the rate from
     the ``base_year`` onwards.
 
+    The rates are held as :py:class:`~.RateBands`, so construction
+    takes time proportional to the number of bands rather than the
+    number of years they cover. :py:meth:`rebase` returns a view that
+    shares the factors already calculated for this schedule.
+
+    Named schedules are held in :py:attr:`SCHEDULES`. The factors for
+    a named schedule and base year are calculated once per process, in
+    a shared curve that is only ever extended, and copied into each
+    :py:class:`~.Discount` using them (where ``year_zero`` is the
+    ``base_year``) as its years are accessed. Each object still holds
+    only the years it has accessed.
+
     Arguments:
       base_year (``int``): The base year for discounting, i.e. the year
         in which the factor is ``1.0``.
-      rates (``dict`` of ``int``: ``float``, optional): The discount
-        rates, where the key is the start year and the value is the
-        rate to apply. Defaults to HM Treasury `Green Book`_ rates.
+      rates (``dict`` of ``int``: ``float``, :py:class:`~.RateBands` or
+        ``str``, optional): The discount rates, where the key is the
+        start year and the value is the rate to apply, or the name of
+        a schedule in :py:attr:`SCHEDULES`. Defaults to HM Treasury
+        `Green Book`_ rates.
       year_zero (``int``, optional): Year zero, the year from which the
         applicable rate is incremented. Defaults to ``base_year``.
 
+    Raises:
+      ValueError: If ``rates`` is not a schedule in
+        :py:attr:`SCHEDULES`.
+
     .. _`Green Book`:
        https://www.gov.uk/government/publications/the-green-book-appraisal-and-evaluation-in-central-governent
 
@@ -32,22 +51,71 @@ class Discount(IndexSeries):
     RATES = {0: 0.035, 31: 0.03, 76: 0.025, 126: 0.02, 201: 0.015, 301: 0.01}
     """Default HM Treasury "Green Book" discount rates."""
 
+    SCHEDULES = {}
+    """Named discount rate schedules, mapping names to
+    :py:class:`~.RateBands` objects."""
+
+    _CURVES = {}
+    """Cached factors for each named schedule and base year, as lists
+    indexed by relative year."""
+
+    _CURVES_LOCK = threading.Lock()
+
+    _ROOTS = {}
+    """The root of rebased views for each set of rates and base year,
+    where the rebased object was not itself a root."""
+
+    _curve = None
+
     def __init__(self, base_year, rates=None, year_zero=None):
         if rates is None:
             rates = self.RATES
-        self._infill_rates(rates)
-        super().__init__(base_year, ExtendedDict(rates),
-                         initial_value=1.0, year_zero=year_zero)
+        if isinstance(rates, str):
+            if rates not in self.SCHEDULES:
+                raise ValueError("Not a valid schedule: {!r}.".format(rates))
+            rates = self.SCHEDULES[rates]
+        if not isinstance(rates, RateBands):
+            rates = RateBands(rates)
+        super().__init__(base_year, rates, initial_value=1.0,
+                         year_zero=year_zero)
+        self._root = None
+        self._curve = self._shared_curve()
 
     def __getitem__(self, year):
-        try:
-            return super().__getitem__(year)
-        except KeyError:
+        if self._root is None:
+            try:
+                return super().__getitem__(year)
+            except KeyError:
+                return 1.0
+        if year <= self.base_year:
             return 1.0
+        scale = self._scale
+        if scale is None:
+            scale = self._scale = self._view_scale()
+        if year <= self.year_zero:
+            return self._values[year - self.year_zero]
+        return self._root[year + self._offset] * scale
 
     def rebase(self, year_zero):
         """Create a :py:class:`~.Discount` with new ``year_zero``.
 
+        The new object is a view on the cumulative factors of a
+        :py:class:`~.Discount` with the same rates whose ``year_zero``
+        is its ``base_year`` (the "root"), shared by every view of
+        it. Each factor is the root's factor for the same relative
+        year, offset by the change in ``year_zero`` and scaled to be
+        ``1.0`` in the ``base_year``. Rebasing does no calculation:
+        the scale is calculated on the first lookup, from the years
+        between the ``base_year`` and the new ``year_zero``. Where
+        this object is not a root, the root for its rates and
+        ``base_year`` is cached, so repeated rebasing of a schedule
+        shares it.
+
+        Note:
+          The factors agree with a newly-constructed
+          :py:class:`~.Discount` to within floating point rounding,
+          and are identical where ``year_zero`` is the ``base_year``.
+
         Arguments:
           year_zero (``int``): The new ``year_zero`` to use.
 
@@ -56,7 +124,111 @@ class Discount(IndexSeries):
             object.
 
         """
-        return Discount(self.base_year, self._rates, year_zero)
+        # pylint: disable=protected-access
+        view = object.__new__(type(self))
+        view.base_year = self.base_year
+        view.year_zero = year_zero
+        view._rates = self._rates
+        view._values = {self.base_year - year_zero: 1.0}
+        view._hash = None
+        view._root = self._view_root()
+        view._offset = self.base_year - year_zero
+        view._scale = None
+        return view
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_curve", None)
+        if "_scale" in state:
+            state["_scale"] = None
+        return state
+
+    def __setstate__(self, state):
+        if state.get("_root") is not None:
+            self.__dict__.update(state)
+            return
+        super().__setstate__(state)
+        self._curve = self._shared_curve()
+
+    def _view_root(self):
+        """The root to use for views rebased from this object."""
+        if self._root is not None:
+            return self._root
+        if self.year_zero == self.base_year:
+            return self
+        key = (self._rates, self.base_year)
+        root = self._ROOTS.get(key)
+        if root is None:
+            root = Discount(self.base_year, self._rates)
+            with self._CURVES_LOCK:
+                root = self._ROOTS.setdefault(key, root)
+        return root
+
+    def _view_scale(self):
+        """The factor scaling the root's factors to this view's.
+
+        Where ``year_zero`` is after the ``base_year``, the factors up
+        to ``year_zero`` are calculated as for a new object.
+
+        """
+        base = self.base_year - self.year_zero
+        if base > 0:
+            return 1.0 / self._root[self.base_year + base]
+        for year in range(base, 0):
+            self._values[year+1] = (self._values[year] /
+                                    (1.0 + self.rate(year+1)))
+        return self._values[0]
+
+    @classmethod
+    def register_schedule(cls, name, rates):
+        """Make a new named schedule available.
+
+        Arguments:
+          name (``str``): The name of the schedule.
+          rates (``dict`` of ``int``: ``float``): The discount rates,
+            where the key is the start year and the value is the rate
+            to apply.
+
+        Raises:
+          ValueError: If ``rates`` is empty.
+
+        """
+        if not rates:
+            raise ValueError("Schedule must include at least one rate.")
+        bands = RateBands(rates)
+        cls.SCHEDULES[name] = bands
+        cls._CURVES.setdefault(bands, {})
+
+    @classmethod
+    def available_schedules(cls):
+        """Show the schedules available in :py:attr:`SCHEDULES`.
+
+        Returns:
+          ``list`` of ``str``: The available schedules.
+
+        """
+        return list(cls.SCHEDULES.keys())
+
+    @classmethod
+    def clear_cache(cls):
+        """Discard the cached factors of every named schedule.
+
+        Existing :py:class:`~.Discount` objects keep their factors;
+        objects created afterwards start a new cache.
+
+        """
+        with cls._CURVES_LOCK:
+            for curves in cls._CURVES.values():
+                curves.clear()
+            cls._ROOTS.clear()
+
+    def _shared_curve(self):
+        """The cached factors, if the rates are a named schedule."""
+        curves = self._CURVES.get(self._rates)
+        if curves is None or self.year_zero != self.base_year:
+            return None
+        with self._CURVES_LOCK:
+            return curves.setdefault(self.base_year, [1.0])
 
     def rate(self, year):
         """The rate used in the specified year.
@@ -73,6 +245,27 @@ class Discount(IndexSeries):
         return super().rate(year)
 
     def _extend_values(self, year):
-        for year_ in range(max(self._values), year):
-            self._values[year_+1] = (self._values[year_] /
-                                     (1.0 + self.rate(year_+1)))
+        curve = self._curve
+        if curve is None:
+            for year_ in range(max(self._values), year):
+                self._values[year_+1] = (self._values[year_] /
+                                         (1.0 + self.rate(year_+1)))
+            return
+        if year >= len(curve):
+            with self._CURVES_LOCK:
+                for year_ in range(len(curve) - 1, year):
+                    curve.append(curve[year_] / (1.0 + self.rate(year_+1)))
+        start = max(self._values) + 1
+        self._values.update(zip(range(start, year + 1),
+                                curve[start:year + 1]))
+
+
+Discount.register_schedule("green book", Discount.RATES)
+Discount.register_schedule("green book health", {
+    0: 0.015, 31: 0.01286, 76: 0.01071, 126: 0.00857, 201: 0.00643,
+    301: 0.00429,
+})
+Discount.register_schedule("green book reduced", {
+    0: 0.03, 31: 0.02571, 76: 0.02143, 126: 0.01714, 201: 0.01286,
+    301: 0.00857,
+})
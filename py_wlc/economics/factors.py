@@ -0,0 +1,129 @@
+"""Precomputed factor tables covering a fixed range of years."""
+from array import array
+import copy
+
+from .cost import Cost
+
+
+class FactorTable:
+    """Discount, deflation and real Present Value factors by year.
+
+    Building the table fully materialises both series over the range,
+    so that later lookups (via the table or the series themselves)
+    never pay the cost of extending the series.
+
+    Arguments:
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      deflator (:py:class:`~.GdpDeflator`): The GDP deflator factors
+        to use.
+      start_year (``int``): The first year to cover.
+      end_year (``int``): The last year to cover.
+
+    Attributes:
+      start_year (``int``): The first year covered.
+      end_year (``int``): The last year covered.
+      discount (``array.array``): The discount factor for each year,
+        as :py:attr:`~.Cost.discount_factor`.
+      deflation (``array.array``): The deflation factor for each year,
+        as :py:attr:`~.Cost.deflation_factor`.
+      real_pv (``array.array``): The product of the discount and
+        deflation factors, i.e. the factor to convert nominal factor
+        costs to Present Value.
+
+    Raises:
+      ValueError: If ``end_year`` precedes ``start_year``.
+
+    """
+
+    def __init__(self, discount, deflator, start_year, end_year):
+        if end_year < start_year:
+            raise ValueError("Table must cover at least one year.")
+        self.start_year = start_year
+        self.end_year = end_year
+        years = range(start_year, end_year + 1)
+        self.discount = array("d", (discount[year] for year in years))
+        self.deflation = array("d", (1 / deflator[year] for year in years))
+        self.real_pv = array("d", (disc * defl for disc, defl in
+                                   zip(self.discount, self.deflation)))
+
+    def __contains__(self, year):
+        return self.start_year <= year <= self.end_year
+
+    def __len__(self):
+        return len(self.discount)
+
+    def recompute(self, discount, deflator, from_year):
+        """Create a table with factors from ``from_year`` onwards replaced.
+
+        Factors for years before ``from_year`` are copied from this
+        table, so only the affected suffix of the range is recalculated
+        from the new series.
+
+        Arguments:
+          discount (:py:class:`~.Discount`): The new discount factors.
+          deflator (:py:class:`~.GdpDeflator`): The new GDP deflator
+            factors.
+          from_year (``int``): The first year to recalculate.
+
+        Returns:
+          :py:class:`~.FactorTable`: The new table.
+
+        """
+        start = min(max(from_year - self.start_year, 0), len(self))
+        years = range(self.start_year + start, self.end_year + 1)
+        table = copy.copy(self)
+        table.discount = self.discount[:start]
+        table.discount.extend(discount[year] for year in years)
+        table.deflation = self.deflation[:start]
+        table.deflation.extend(1 / deflator[year] for year in years)
+        table.real_pv = self.real_pv[:start]
+        table.real_pv.extend(disc * defl for disc, defl in
+                             zip(table.discount[start:],
+                                 table.deflation[start:]))
+        return table
+
+    def factors(self, year):
+        """The discount and deflation factors for the specified year.
+
+        Arguments:
+          year (``int``): The year to retrieve the factors for.
+
+        Returns:
+          ``tuple`` of ``float``: The discount and deflation factors.
+
+        Raises:
+          KeyError: If ``year`` is not covered by the table.
+
+        """
+        index = self._index(year)
+        return self.discount[index], self.deflation[index]
+
+    def multiplier(self, year, type_):
+        """The factor to convert a nominal factor cost to ``type_``.
+
+        Arguments:
+          year (``int``): The year in which the cost is incurred.
+          type_ (``int``): The type to convert to; market price
+            adjustment is not included.
+
+        Returns:
+          float: The conversion factor.
+
+        Raises:
+          KeyError: If ``year`` is not covered by the table.
+          ValueError: If ``type_`` is invalid.
+
+        """
+        Cost.validate_type(type_)
+        index = self._index(year)
+        if type_ & Cost.PRESENT_VALUE:
+            return self.real_pv[index]
+        if type_ & Cost.REAL:
+            return self.deflation[index]
+        return 1.0
+
+    def _index(self, year):
+        """The index of the specified year in the factor arrays."""
+        if year not in self:
+            raise KeyError(year)
+        return year - self.start_year
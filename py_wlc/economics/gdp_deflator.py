@@ -1,4 +1,7 @@
 """Provides conversion between nominal and real prices."""
+from array import array
+from collections.abc import Sequence
+
 from ..generic import ExtendedDict, IndexSeries
 
 
@@ -20,9 +23,34 @@ class GdpDeflator(IndexSeries):
     """
 
     def __init__(self, base_year, rates, extend=False):
+        self._setup(base_year, {year-base_year: rate
+                                for year, rate in rates.items()}, extend)
+
+    @classmethod
+    def from_arrays(cls, base_year, years, rates, extend=False):
+        """Create a deflator from parallel sequences of years and rates.
+
+        Arguments:
+          base_year (``int``): The price base year to deflate to.
+          years (sequence of ``int``): The years.
+          rates (sequence of ``float``): The rate for each year.
+          extend (``bool``, optional): Whether or not to extend the
+            rates beyond the predefined data. Defaults to ``False``.
+
+        Returns:
+          :py:class:`~.GdpDeflator`: A new class instance.
+
+        """
+        deflator = cls.__new__(cls)
+        deflator._setup(base_year,
+                        dict(zip(map(base_year.__rsub__, years), rates)),
+                        extend)
+        return deflator
+
+    def _setup(self, base_year, rates, extend):
+        """Initialise from rates keyed by year relative to ``base_year``."""
         if not rates:
-            rates = {base_year: 0.0}
-        rates = {year-base_year: rate for year, rate in rates.items()}
+            rates = {0: 0.0}
         if extend:
             rates = ExtendedDict(rates)
         super().__init__(base_year, rates, 1.0)
@@ -43,6 +71,75 @@ class GdpDeflator(IndexSeries):
             year_to = self.base_year
         return self.__getitem__(year_to) / self.__getitem__(year_from)
 
+    def index(self, start_year, end_year):
+        """The deflator values for a range of years.
+
+        Arguments:
+          start_year (``int``): The first year to include.
+          end_year (``int``): The last year to include.
+
+        Returns:
+          ``array.array``: The value for each year from ``start_year``
+            to ``end_year``.
+
+        """
+        return array("d", (self.__getitem__(year) for year in
+                           range(start_year, end_year + 1)))
+
+    def rebase_prices(self, values, price_years, year_to=None):
+        """Convert values quoted in many price bases to a single base.
+
+        The deflator values covering every price base year are gathered
+        once, then the values are converted in a single pass. Each
+        result is identical to ``value * conversion_factor(year,
+        year_to)``.
+
+        Arguments:
+          values (sequence of ``float``): The values to convert.
+          price_years (sequence of ``int``): The price base year of
+            each value.
+          year_to (``int``, optional): The price base year to convert
+            to. Defaults to :py:attr:`~.base_year`.
+
+        Returns:
+          ``array.array``: The converted values.
+
+        Raises:
+          ValueError: If ``values`` and ``price_years`` differ in
+            length.
+
+        """
+        if len(values) != len(price_years):
+            raise ValueError("Values and price years must be the same "
+                             "length.")
+        if not values:
+            return array("d")
+        if year_to is None:
+            year_to = self.base_year
+        start_year = min(price_years)
+        target = self.__getitem__(year_to)
+        factors = [target / value for value in
+                   self.index(start_year, max(price_years))]
+        return array("d", [value * factors[year - start_year] for
+                           value, year in zip(values, price_years)])
+
+    def ledger_view(self, ledger, year_to=None):
+        """A lazily re-based view of a ledger of costs.
+
+        Arguments:
+          ledger (sequence of ``tuple``): The ``(value, price_year)``
+            entries of the ledger.
+          year_to (``int``, optional): The price base year to convert
+            to. Defaults to :py:attr:`~.base_year`.
+
+        Returns:
+          :py:class:`RebasedLedger`: The view.
+
+        """
+        if year_to is None:
+            year_to = self.base_year
+        return RebasedLedger(ledger, self, year_to)
+
     def _extend_values(self, year):
         min_year = min(self._values)
         max_year = max(self._values)
@@ -54,3 +151,50 @@ class GdpDeflator(IndexSeries):
             for year_ in range(max_year, year):
                 fact = 1 + self._rates.get(year_, 0)
                 self._values[year_+1] = self._values[year_] * fact
+
+
+class RebasedLedger(Sequence):
+    """A read-only view of a ledger, converted to a single price base.
+
+    Entries are converted when accessed, and the ledger is never
+    copied; slicing creates a new view of the same ledger. Changes to
+    the underlying ledger are reflected in the view.
+
+    Arguments:
+      ledger (sequence of ``tuple``): The ``(value, price_year)``
+        entries of the ledger.
+      deflator (:py:class:`GdpDeflator`): The GDP deflator factors to
+        use.
+      year_to (``int``): The price base year to convert to.
+      indices (``range``, optional): The entries of the ledger covered
+        by the view. Defaults to the whole ledger.
+
+    """
+
+    def __init__(self, ledger, deflator, year_to, indices=None):
+        self.ledger = ledger
+        self.deflator = deflator
+        self.year_to = year_to
+        self._indices = indices
+        self._factors = {}
+
+    @property
+    def indices(self):
+        """The entries of the ledger covered by the view."""
+        if self._indices is None:
+            return range(len(self.ledger))
+        return self._indices
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RebasedLedger(self.ledger, self.deflator, self.year_to,
+                                 self.indices[index])
+        value, year = self.ledger[self.indices[index]]
+        if year not in self._factors:
+            self._factors[year] = self.deflator.conversion_factor(
+                year, self.year_to
+            )
+        return value * self._factors[year]
+
+    def __len__(self):
+        return len(self.indices)
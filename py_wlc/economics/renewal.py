@@ -0,0 +1,141 @@
+"""Renewal cycles and terminal residual values of long-life assets.
+
+An asset with a life shorter than the appraisal period is replaced at
+the end of each life. :py:class:`RenewalCycle` calculates the Present
+Value of those replacements and of the residual value remaining at the
+end of the appraisal, for a whole asset register at once.
+
+"""
+import math
+
+
+class RenewalCycle:
+    """Discounted renewals and residual values over an appraisal period.
+
+    Assets are replaced, at their original ``value``, every ``life``
+    years after they are built. Only replacements falling within the
+    appraisal period are counted. The residual value of the final
+    replacement (or the original asset, if never replaced) at
+    ``end_year`` is discounted from that year.
+
+    The discount factors for the period are gathered once. The sum of
+    the factors at every ``life``-th year from a given start year is
+    the only per-asset quantity needed for the renewals, and is cached,
+    so assets sharing a life and renewal phase share the work.
+
+    Arguments:
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      calculator (:py:class:`~.ResidualValueCalculator`): The
+        calculator for terminal residual values.
+      start_year (``int``): The first year of the appraisal.
+      end_year (``int``): The last year of the appraisal.
+
+    Raises:
+      ValueError: If ``end_year`` precedes ``start_year``.
+
+    """
+
+    def __init__(self, discount, calculator, start_year, end_year):
+        if end_year < start_year:
+            raise ValueError("Appraisal must cover at least one year.")
+        self.calculator = calculator
+        self.start_year = start_year
+        self.end_year = end_year
+        self.factors = [discount[year] for year in
+                        range(start_year, end_year + 1)]
+        self._sums = {}
+
+    def _first_renewal(self, life, build_year):
+        """The year of the first renewal within the appraisal period."""
+        cycles = max(1, -((build_year - self.start_year) // life))
+        return build_year + (cycles * life)
+
+    def _renewal_factor(self, first_year, life):
+        """Sum of discount factors at every ``life``-th year from
+        ``first_year`` to the end of the appraisal."""
+        key = (first_year, life)
+        if key not in self._sums:
+            self._sums[key] = math.fsum(
+                self.factors[first_year - self.start_year::life])
+        return self._sums[key]
+
+    def evaluate(self, asset_register):
+        """Calculate discounted renewals and residual value per asset.
+
+        Arguments:
+          asset_register (iterable of ``tuple``): The assets, each as
+            ``(value, life, build_year, scrap_value)``.
+
+        Returns:
+          ``list`` of ``tuple``: The Present Value of the renewals and
+            of the terminal residual value, for each asset.
+
+        Raises:
+          ValueError: If any asset's ``life`` is not positive.
+
+        """
+        end_year = self.end_year
+        final_factor = self.factors[-1]
+        calculate = self.calculator.calculate
+        out = []
+        for value, life, build_year, scrap_value in asset_register:
+            if life <= 0:
+                raise ValueError("Asset life must be positive.")
+            if build_year > end_year:
+                out.append((0.0, 0.0))
+                continue
+            first_year = self._first_renewal(life, build_year)
+            renewals = 0.0
+            if first_year <= end_year:
+                renewals = value * self._renewal_factor(first_year, life)
+            last_build = build_year + ((end_year - build_year) // life) * life
+            residual = calculate(value, life, last_build,
+                                 end_year, scrap_value)
+            out.append((renewals, residual * final_factor))
+        return out
+
+    def total(self, asset_register):
+        """Total discounted renewals and residual value of all assets.
+
+        Arguments:
+          asset_register (iterable of ``tuple``): The assets, each as
+            ``(value, life, build_year, scrap_value)``.
+
+        Returns:
+          ``tuple`` of ``float``: The total Present Value of renewals
+            and of terminal residual values.
+
+        """
+        results = self.evaluate(asset_register)
+        return (math.fsum(renewals for renewals, _ in results),
+                math.fsum(residual for _, residual in results))
+
+    def stream(self, asset_register):
+        """The discounted renewal costs in each year of the appraisal.
+
+        Arguments:
+          asset_register (iterable of ``tuple``): The assets, each as
+            ``(value, life, build_year, scrap_value)``.
+
+        Returns:
+          ``list`` of ``float``: The total Present Value of renewals in
+            each year from ``start_year`` to ``end_year``.
+
+        Raises:
+          ValueError: If any asset's ``life`` is not positive.
+
+        """
+        groups = {}
+        for value, life, build_year, _ in asset_register:
+            if life <= 0:
+                raise ValueError("Asset life must be positive.")
+            if build_year > self.end_year:
+                continue
+            first = self._first_renewal(life, build_year) - self.start_year
+            groups.setdefault((first, life), []).append(value)
+        terms = [[] for _ in self.factors]
+        for (first, life), values in groups.items():
+            value = math.fsum(values)
+            for index in range(first, len(terms), life):
+                terms[index].append(value * self.factors[index])
+        return [math.fsum(year_terms) for year_terms in terms]
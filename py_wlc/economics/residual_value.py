@@ -18,9 +18,137 @@ def sum_of_years_digits(year):
     return year + sum_of_years_digits(year-1)
 
 
+class DepreciationMethod:
+    """A method for calculating residual value, for scalars and arrays.
+
+    Either supply the implementations as arguments or subclass and
+    override :py:meth:`scalar` (and, optionally, :py:meth:`array`). If
+    no array implementation is supplied, :py:meth:`array` falls back to
+    calling :py:meth:`scalar` for each age, so every registered method
+    can be used by :py:meth:`~.ResidualValueCalculator.schedule`.
+
+    Arguments:
+      scalar (``callable``, optional): The scalar implementation, with
+        the signature of :py:meth:`scalar`.
+      array (``callable``, optional): The array implementation, with
+        the signature of :py:meth:`array`.
+
+    """
+
+    def __init__(self, scalar=None, array=None):
+        if scalar is not None:
+            self.scalar = scalar
+        if array is not None:
+            self.array = array
+
+    def scalar(self, value, life, build_year, target_year, scrap_value):
+        """Calculate the residual value in a year within the life.
+
+        Arguments:
+          value (``float``): The initial asset value.
+          life (``int``): The life of the asset, in years.
+          build_year (``int``): The year in which the asset is built.
+          target_year (``int``): The year in which to calculate the
+            asset's residual value.
+          scrap_value (``float``): The asset's value after life expiry.
+
+        Returns:
+          float: The calculated residual value.
+
+        """
+        raise NotImplementedError
+
+    def array(self, value, life, first_age, last_age, scrap_value):
+        """Calculate the residual values over a range of ages.
+
+        Arguments:
+          value (``float``): The initial asset value.
+          life (``int``): The life of the asset, in years.
+          first_age (``int``): The first age (years since build).
+          last_age (``int``): The last age (years since build).
+          scrap_value (``float``): The asset's value after life expiry.
+
+        Returns:
+          ``list`` of ``float``: The values for each age.
+
+        """
+        return [self.scalar(value, life, 0, age, scrap_value)
+                for age in range(first_age, last_age + 1)]
+
+
+class DecliningBalance(DepreciationMethod):
+    """Declining balance depreciation with a configurable rate.
+
+    The same proportion of the remaining value, ``multiple`` times the
+    proportion lost each year under the linear method, is lost in each
+    year of the asset's life.
+
+    Arguments:
+      multiple (``float``): The multiple of the linear rate to use
+        (e.g. ``2`` for double-declining, ``1.5`` for 150%).
+
+    """
+
+    def __init__(self, multiple):
+        super().__init__()
+        self.multiple = multiple
+
+    def scalar(self, value, life, build_year, target_year, scrap_value):
+        _ = scrap_value
+        ratio = 1 - (self.multiple * (1 / life))
+        return value * ratio ** (target_year - build_year)
+
+    def array(self, value, life, first_age, last_age, scrap_value):
+        _ = scrap_value
+        ratio = 1 - (self.multiple * (1 / life))
+        current = value * ratio ** first_age
+        out = [current]
+        for _ in range(first_age, last_age):
+            current *= ratio
+            out.append(current)
+        return out
+
+
+_DOUBLE_DECLINING = DecliningBalance(2)
+"""The built-in double-declining method."""
+
+
+class Annuity(DepreciationMethod):
+    """Annuity depreciation at a fixed interest rate.
+
+    The depreciable amount is recovered like the capital of an annuity,
+    so that less value is lost in the early years of the asset's life.
+
+    Arguments:
+      rate (``float``): The annual interest rate (e.g. ``0.035``).
+
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def scalar(self, value, life, build_year, target_year, scrap_value):
+        return self.array(value, life, target_year - build_year,
+                          target_year - build_year, scrap_value)[0]
+
+    def array(self, value, life, first_age, last_age, scrap_value):
+        growth = 1 + self.rate
+        loss = value - scrap_value
+        denominator = growth ** life - 1
+        if not denominator:
+            return [loss * (1 - (age / life)) + scrap_value
+                    for age in range(first_age, last_age + 1)]
+        return [value - loss * ((growth ** age - 1) / denominator)
+                for age in range(first_age, last_age + 1)]
+
+
 class ResidualValueCalculator:
     """A calculator to generate residual values of assets.
 
+    Additional methods can be made available with
+    :py:meth:`register_method`.
+
     Arguments:
       method (``str``): The method to use for the calculation (must be
         in :py:attr:`METHODS`, see `Wikipedia`_ for method details).
@@ -33,16 +161,16 @@ class ResidualValueCalculator:
 
     """
 
-    METHODS = {"linear": "linear",
-               "double-declining": "double_declining",
-               "sum of years' digits": "sum_of_years"}
-    """Available methods for calculation of residual value."""
+    METHODS = {}
+    """Available methods for calculation of residual value, mapping
+    names to :py:class:`DepreciationMethod` objects."""
 
     def __init__(self, method):
         if method not in self.METHODS:
             raise ValueError("Not a valid method: {!r}.".format(method))
         self._method = method
-        self.func = getattr(self, self.METHODS[method])
+        self.func = self.METHODS[method].scalar
+        self.row_func = self.METHODS[method].array
 
     @property
     def method(self):
@@ -88,6 +216,66 @@ class ResidualValueCalculator:
                    self.func(value, life, build_year,
                              target_year, scrap_value))
 
+    def schedule(self, asset_register, start_year, end_year):
+        """Calculate residual values for many assets over many years.
+
+        Each asset's row is built from a closed form (or, for the
+        double-declining method, a constant-ratio recurrence) over its
+        whole life at once, rather than by calling :py:meth:`calculate`
+        for each year. Values follow the same rules as
+        :py:meth:`calculate`, except that years before an asset is
+        built have a residual value of ``0.0``.
+
+        Arguments:
+          asset_register (iterable of ``tuple``): The assets, each as
+            ``(value, life, build_year, scrap_value)``.
+          start_year (``int``): The first year of the schedule.
+          end_year (``int``): The last year of the schedule.
+
+        Returns:
+          ``list`` of ``list`` of ``float``: One row per asset, with
+            one column per year from ``start_year`` to ``end_year``.
+
+        Raises:
+          ValueError: If ``end_year`` precedes ``start_year``.
+
+        """
+        if end_year < start_year:
+            raise ValueError("Schedule must cover at least one year.")
+        years = end_year - start_year + 1
+        rows = []
+        for value, life, build_year, scrap_value in asset_register:
+            first = start_year - build_year
+            last = first + years - 1
+            row = [0.0] * min(years, max(0, -first))
+            if first <= 0 <= last:
+                row.append(value)
+            first_age, last_age = max(first, 1), min(last, life)
+            if first_age <= last_age:
+                row.extend(max(scrap_value, val) for val in
+                           self.row_func(value, life, first_age,
+                                         last_age, scrap_value))
+            row.extend([scrap_value] * (years - len(row)))
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def register_method(cls, name, method):
+        """Make a new method available for calculation.
+
+        Arguments:
+          name (``str``): The name of the method.
+          method (:py:class:`DepreciationMethod`): The implementation.
+
+        Raises:
+          TypeError: If ``method`` is not a
+            :py:class:`DepreciationMethod`.
+
+        """
+        if not isinstance(method, DepreciationMethod):
+            raise TypeError("Not a DepreciationMethod: {!r}.".format(method))
+        cls.METHODS[name] = method
+
     @classmethod
     def available_methods(cls):
         """Show the methods available in :py:attr:`METHODS`.
@@ -123,8 +311,30 @@ class ResidualValueCalculator:
            http://en.wikipedia.org/wiki/Depreciation#Declining_Balance_Method
 
         """
-        _ = scrap_value
-        return value * (1 - (2 * (1 / life))) ** (target_year - build_year)
+        return _DOUBLE_DECLINING.scalar(value, life, build_year,
+                                        target_year, scrap_value)
+
+    @staticmethod
+    def double_declining_row(value, life, first_age, last_age, scrap_value):
+        """Vectorised :py:meth:`double_declining` over a range of ages.
+
+        Uses the recurrence of a constant ratio between years, so each
+        value after the first costs a single multiplication (see
+        :py:meth:`DecliningBalance.array`).
+
+        Arguments:
+          value (``float``): The initial asset value.
+          life (``int``): The life of the asset, in years.
+          first_age (``int``): The first age (years since build).
+          last_age (``int``): The last age (years since build).
+          scrap_value (``float``): The asset's value after life expiry.
+
+        Returns:
+          ``list`` of ``float``: The values for each age.
+
+        """
+        return _DOUBLE_DECLINING.array(value, life, first_age, last_age,
+                                       scrap_value)
 
     @staticmethod
     def linear(value, life, build_year, target_year, scrap_value):
@@ -152,6 +362,25 @@ class ResidualValueCalculator:
         fact = 1 - ((target_year - build_year) / life)
         return ((value - scrap_value) * fact) + scrap_value
 
+    @staticmethod
+    def linear_row(value, life, first_age, last_age, scrap_value):
+        """Vectorised :py:meth:`linear` over a range of ages.
+
+        Arguments:
+          value (``float``): The initial asset value.
+          life (``int``): The life of the asset, in years.
+          first_age (``int``): The first age (years since build).
+          last_age (``int``): The last age (years since build).
+          scrap_value (``float``): The asset's value after life expiry.
+
+        Returns:
+          ``list`` of ``float``: The values for each age.
+
+        """
+        loss = value - scrap_value
+        return [(loss * (1 - (age / life))) + scrap_value
+                for age in range(first_age, last_age + 1)]
+
     @staticmethod
     def sum_of_years(value, life, build_year, target_year, scrap_value):
         """Calculate residual value with sum of years' digits method.
@@ -180,5 +409,41 @@ class ResidualValueCalculator:
         fact /= sum_of_years_digits(life)
         return scrap_value + ((value - scrap_value) * (1 - fact))
 
+    @staticmethod
+    def sum_of_years_row(value, life, first_age, last_age, scrap_value):
+        """Vectorised :py:meth:`sum_of_years` over a range of ages.
 
+        Uses the closed form ``n * (n + 1) / 2`` for the sum of years'
+        digits.
 
+        Arguments:
+          value (``float``): The initial asset value.
+          life (``int``): The life of the asset, in years.
+          first_age (``int``): The first age (years since build).
+          last_age (``int``): The last age (years since build).
+          scrap_value (``float``): The asset's value after life expiry.
+
+        Returns:
+          ``list`` of ``float``: The values for each age.
+
+        """
+        total = life * (life + 1) // 2
+        loss = value - scrap_value
+        out = []
+        for age in range(first_age, last_age + 1):
+            res_life = life - age
+            fact = (total - (res_life * (res_life + 1) // 2)) / total
+            out.append(scrap_value + (loss * (1 - fact)))
+        return out
+
+
+ResidualValueCalculator.register_method(
+    "linear",
+    DepreciationMethod(ResidualValueCalculator.linear,
+                       ResidualValueCalculator.linear_row))
+ResidualValueCalculator.register_method("double-declining",
+                                        _DOUBLE_DECLINING)
+ResidualValueCalculator.register_method(
+    "sum of years' digits",
+    DepreciationMethod(ResidualValueCalculator.sum_of_years,
+                       ResidualValueCalculator.sum_of_years_row))
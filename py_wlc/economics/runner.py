@@ -0,0 +1,248 @@
+"""Multi-process evaluation of large cost and asset portfolios.
+
+:py:class:`AppraisalRunner` splits portfolios into chunks and evaluates
+them in a process pool. The discount and deflation factors for the
+appraisal period are materialised once, into a shared memory block
+that every worker attaches to, rather than being pickled for each
+chunk or recalculated in each process.
+
+Each chunk's total is held exactly, as an :py:class:`~.ExactSum`, and
+the chunk totals merged exactly, so the totals are identical whether
+chunks are evaluated in the pool or in-process (``workers=0``), and
+whatever the chunk size and number of workers.
+
+Note:
+  Shared memory (:py:mod:`multiprocessing.shared_memory`) requires
+  Python 3.8 or later; on earlier versions only ``workers=0`` can be
+  used.
+
+"""
+from collections import namedtuple
+from itertools import islice
+from multiprocessing import Pool
+import os
+import time
+
+from ..utils.summation import ExactSum
+from .cost import Cost
+from .factors import FactorTable
+from .renewal import RenewalCycle
+from .residual_value import ResidualValueCalculator
+from .stream import convert_records
+
+
+AppraisalResult = namedtuple("AppraisalResult", ["costs", "renewals",
+                                                 "residual", "throughput"])
+"""The totals of an appraisal, and the throughput of each worker."""
+
+_STATE = {}
+"""Per-process state, set up by :py:func:`_attach`."""
+
+
+class _SharedFactors:
+    """Year-indexed view of a factor array, for :py:class:`~.RenewalCycle`."""
+
+    def __init__(self, factors, start_year):
+        self.factors = factors
+        self.start_year = start_year
+
+    def __getitem__(self, year):
+        return self.factors[year - self.start_year]
+
+
+def _attach(name, start_year, end_year, method):
+    """Attach a worker process to the shared factor arrays.
+
+    Arguments:
+      name (``str``): The name of the shared memory block.
+      start_year (``int``): The first year of the appraisal.
+      end_year (``int``): The last year of the appraisal.
+      method (``str``): The residual value calculation method.
+
+    """
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    years = end_year - start_year + 1
+    factors = shm.buf.cast("d")
+    _setup(factors[:years], factors[years:], start_year, end_year, method)
+    _STATE["shm"] = shm
+
+
+def _setup(discount, deflation, start_year, end_year, method):
+    """Set up the per-process state for evaluating chunks."""
+    _STATE.update(discount=discount, deflation=deflation,
+                  start_year=start_year, end_year=end_year,
+                  cycle=RenewalCycle(_SharedFactors(discount, start_year),
+                                     ResidualValueCalculator(method),
+                                     start_year, end_year))
+
+
+def _evaluate_costs(args):
+    """Convert a chunk of cost records and total them.
+
+    Arguments:
+      args (``tuple``): The chunk of records and the type to convert
+        to.
+
+    Returns:
+      ``tuple``: The process ID, number of records, elapsed time and
+        total converted value (as an :py:class:`~.ExactSum`).
+
+    Raises:
+      ValueError: If any record's year is outside the appraisal period
+        or any type is invalid.
+
+    """
+    start = time.perf_counter()
+    chunk, type_ = args
+    discount, deflation = _STATE["discount"], _STATE["deflation"]
+    start_year, end_year = _STATE["start_year"], _STATE["end_year"]
+    factors = {}
+    for year in {record[2] for record in chunk}:
+        if not start_year <= year <= end_year:
+            raise ValueError("Year outside appraisal: {!r}.".format(year))
+        factors[year] = (discount[year - start_year],
+                         deflation[year - start_year])
+    out = convert_records(chunk, type_, factors)
+    return (os.getpid(), len(chunk), time.perf_counter() - start,
+            ExactSum(out))
+
+
+def _evaluate_assets(chunk):
+    """Evaluate renewals and residual values for a chunk of assets.
+
+    Arguments:
+      chunk (``list`` of ``tuple``): The assets to evaluate.
+
+    Returns:
+      ``tuple``: The process ID, number of assets, elapsed time and
+        the renewal and residual value totals (as
+        :py:class:`~.ExactSum` objects).
+
+    """
+    start = time.perf_counter()
+    results = _STATE["cycle"].evaluate(chunk)
+    return (os.getpid(), len(chunk), time.perf_counter() - start,
+            (ExactSum(renewals for renewals, _ in results),
+             ExactSum(residual for _, residual in results)))
+
+
+def _chunks(iterable, size):
+    """Split an iterable into lists of up to ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class AppraisalRunner:
+    """Evaluates cost and asset portfolios in chunks across processes.
+
+    Arguments:
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      deflator (:py:class:`~.GdpDeflator`): The GDP deflator factors
+        to use.
+      start_year (``int``): The first year of the appraisal.
+      end_year (``int``): The last year of the appraisal; all costs
+        must fall between ``start_year`` and ``end_year``.
+      chunk_size (``int``, optional): The number of records or assets
+        per chunk. Defaults to ``10000``.
+      workers (``int``, optional): The number of worker processes, or
+        ``0`` to evaluate in-process. Defaults to ``os.cpu_count()``.
+      method (``str``, optional): The residual value calculation method
+        for assets. Defaults to ``"linear"``.
+
+    Raises:
+      ValueError: If ``chunk_size`` is not positive or ``workers`` is
+        negative.
+
+    """
+
+    def __init__(self, discount, deflator, start_year, end_year,
+                 chunk_size=10000, workers=None, method="linear"):
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 0:
+            raise ValueError("Number of workers cannot be negative.")
+        ResidualValueCalculator(method)
+        self.table = FactorTable(discount, deflator, start_year, end_year)
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.method = method
+
+    def run(self, costs=(), assets=(), type_=Cost.PRESENT_VALUE):
+        """Evaluate the portfolio.
+
+        Arguments:
+          costs (iterable of ``tuple``, optional): The cost records, as
+            ``(value, type_, year, adjustment_factor)``.
+          assets (iterable of ``tuple``, optional): The assets, as
+            ``(value, life, build_year, scrap_value)``.
+          type_ (``int``, optional): The type to convert costs to.
+            Defaults to :py:attr:`~.Cost.PRESENT_VALUE`.
+
+        Returns:
+          :py:class:`AppraisalResult`: The total converted costs, total
+            discounted renewals and residual values, and the number of
+            items, time spent and rate (items per second) for each
+            worker process.
+
+        """
+        table = self.table
+        cost_chunks = ((chunk, type_) for chunk in
+                       _chunks(costs, self.chunk_size))
+        asset_chunks = _chunks(assets, self.chunk_size)
+        if self.workers == 0:
+            _setup(table.discount, table.deflation, table.start_year,
+                   table.end_year, self.method)
+            try:
+                cost_results = list(map(_evaluate_costs, cost_chunks))
+                asset_results = list(map(_evaluate_assets, asset_chunks))
+            finally:
+                _STATE.clear()
+            return self._reduce(cost_results, asset_results)
+        from multiprocessing import shared_memory
+        factors = table.discount + table.deflation
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(1, len(factors) * 8))
+        try:
+            shm.buf[:len(factors) * 8] = factors.tobytes()
+            with Pool(self.workers, _attach,
+                      (shm.name, table.start_year, table.end_year,
+                       self.method)) as pool:
+                cost_results = list(pool.imap(_evaluate_costs, cost_chunks))
+                asset_results = list(pool.imap(_evaluate_assets,
+                                               asset_chunks))
+        finally:
+            shm.close()
+            shm.unlink()
+        return self._reduce(cost_results, asset_results)
+
+    @staticmethod
+    def _reduce(cost_results, asset_results):
+        """Combine chunk results, in chunk order."""
+        throughput = {}
+        costs, renewals, residual = ExactSum(), ExactSum(), ExactSum()
+        for pid, number, elapsed, total in cost_results:
+            costs.merge(total)
+            AppraisalRunner._record(throughput, pid, number, elapsed)
+        for pid, number, elapsed, (renewal, resid) in asset_results:
+            renewals.merge(renewal)
+            residual.merge(resid)
+            AppraisalRunner._record(throughput, pid, number, elapsed)
+        for stats in throughput.values():
+            stats["rate"] = (stats["items"] / stats["seconds"]
+                             if stats["seconds"] else float("inf"))
+        return AppraisalResult(float(costs), float(renewals),
+                               float(residual), throughput)
+
+    @staticmethod
+    def _record(throughput, pid, number, elapsed):
+        """Add a chunk's size and elapsed time to a worker's stats."""
+        stats = throughput.setdefault(pid, {"items": 0, "seconds": 0.0})
+        stats["items"] += number
+        stats["seconds"] += elapsed
@@ -0,0 +1,151 @@
+"""Streaming conversion of cost records in fixed-size batches.
+
+The functions in this module consume an iterable (or asynchronous
+iterable) of raw cost records and yield the converted values in
+batches, without ever holding more than one batch in memory. Each
+record is a tuple of ``(value, type_, year, adjustment_factor)``, i.e.
+the arguments to :py:class:`~.Cost` without the factor series.
+
+"""
+import asyncio
+from itertools import islice
+
+from .cost import Cost
+
+
+def convert_records(records, type_, factors):
+    """Convert cost records to the specified ``type_``.
+
+    Each record's value is divided by the multipliers for its own type
+    and multiplied by those for ``type_``, using the exponents in
+    :py:attr:`~.Cost.TYPE_TABLE`.
+
+    Arguments:
+      records (iterable of ``tuple``): The cost records to convert.
+      type_ (``int``): The type to convert to.
+      factors (``dict``): The discount and deflation factors, as
+        ``(discount_factor, deflation_factor)``, keyed by year.
+
+    Returns:
+      ``list`` of ``float``: The converted values, in record order.
+
+    Raises:
+      ValueError: If ``type_`` or any record's type is invalid.
+
+    """
+    table, mask = Cost.TYPE_TABLE, Cost.TYPE_MASK
+    error, to_disc, to_defl, to_adj = table[type_ & mask]
+    if error is not None:
+        raise ValueError(error)
+    out = []
+    for value, from_type, year, adjustment_factor in records:
+        error, disc, defl, adj = table[from_type & mask]
+        if error is not None:
+            raise ValueError(error)
+        discount_factor, deflation_factor = factors[year]
+        value /= (discount_factor ** disc * deflation_factor ** defl *
+                  adjustment_factor ** adj)
+        out.append(value * (discount_factor ** to_disc *
+                            deflation_factor ** to_defl *
+                            adjustment_factor ** to_adj))
+    return out
+
+
+def convert_batch(records, type_, discount, deflator):
+    """Convert a batch of cost records to the specified ``type_``.
+
+    The discount and deflation factors are gathered once for each
+    distinct year in the batch, rather than once per record.
+
+    Arguments:
+      records (``list`` of ``tuple``): The cost records to convert.
+      type_ (``int``): The type to convert to.
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      deflator (:py:class:`~.GdpDeflator`): The GDP deflator factors
+        to use.
+
+    Returns:
+      ``list`` of ``float``: The converted values, in record order.
+
+    Raises:
+      ValueError: If ``type_`` or any record's type is invalid.
+
+    """
+    factors = {year: (discount[year], 1 / deflator[year])
+               for year in {record[2] for record in records}}
+    return convert_records(records, type_, factors)
+
+
+def convert_stream(records, type_, discount, deflator, batch_size=1000):
+    """Lazily convert a stream of cost records, batch by batch.
+
+    Arguments:
+      records (iterable of ``tuple``): The cost records to convert;
+        may be unbounded.
+      type_ (``int``): The type to convert to.
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      deflator (:py:class:`~.GdpDeflator`): The GDP deflator factors
+        to use.
+      batch_size (``int``, optional): The maximum number of records
+        per batch. Defaults to ``1000``.
+
+    Yields:
+      ``list`` of ``float``: The converted values for each batch.
+
+    Raises:
+      ValueError: If ``batch_size`` is not positive.
+
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive.")
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield convert_batch(batch, type_, discount, deflator)
+
+
+async def aconvert_stream(records, type_, discount, deflator,
+                          batch_size=1000):
+    """Asynchronous version of :py:func:`convert_stream`.
+
+    Records are only pulled from ``records`` when the consumer asks for
+    the next batch, so a slow consumer naturally applies backpressure
+    to the producer. Control is returned to the event loop after each
+    batch is converted.
+
+    Arguments:
+      records (iterable or asynchronous iterable of ``tuple``): The
+        cost records to convert; may be unbounded.
+      type_ (``int``): The type to convert to.
+      discount (:py:class:`~.Discount`): The discount factors to use.
+      deflator (:py:class:`~.GdpDeflator`): The GDP deflator factors
+        to use.
+      batch_size (``int``, optional): The maximum number of records
+        per batch. Defaults to ``1000``.
+
+    Yields:
+      ``list`` of ``float``: The converted values for each batch.
+
+    Raises:
+      ValueError: If ``batch_size`` is not positive.
+
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive.")
+    if not hasattr(records, "__aiter__"):
+        for batch in convert_stream(records, type_, discount,
+                                    deflator, batch_size):
+            yield batch
+            await asyncio.sleep(0)
+        return
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield convert_batch(batch, type_, discount, deflator)
+            batch = []
+            await asyncio.sleep(0)
+    if batch:
+        yield convert_batch(batch, type_, discount, deflator)
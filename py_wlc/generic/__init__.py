@@ -1,6 +1,8 @@
 """Generic functionality supporting the core modelling."""
 
+from ..utils import instrumentation
 from .growth import IndexSeries
+from .series import RateBands, ValueSeries
 
 
 class ExtendedDict(dict):
@@ -47,6 +49,8 @@ class ExtendedDict(dict):
         try:
             return super().__getitem__(key)
         except KeyError:
+            if instrumentation.ENABLED:
+                instrumentation.count(__name__, "clamp")
             if self and key > max(self):
                 return self[max(self)]
             elif self and key < min(self):
@@ -1,13 +1,14 @@
 """Generic functionality for modelling growth series."""
+from ..utils import instrumentation
 
 
 class IndexSeries:
 
     """Growth rates and factors for indexation series.
 
-    The ``_rates`` dictionary is fully-populated at initialisation, but
-    the ``_values`` dictionary is filled lazily - values are only
-    calculated as needed.
+    The ``_rates`` are fixed at initialisation, but the ``_values``
+    dictionary is filled lazily - values are only calculated as needed.
+    Only the rates and the initial value are pickled.
 
     The class supports a ``Mapping``-like interface; factors can be
     accessed with ``value = growth_rate[year]`` or ``value =
@@ -22,8 +23,8 @@ class IndexSeries:
     Arguments:
       base_year (``int``): the year in which the value is equal to the
         ``initial_value``
-      rates (``dict`` of ``int``: ``float``): the growth rates to use,
-        keyed by relative year
+      rates (``dict`` of ``int``: ``float`` or :py:class:`~.RateBands`):
+        the growth rates to use, keyed by relative year
       initial_value (``float``): the first value for the output series.
       year_zero (``int``, optional): the zeroth year for accessing
         growth rates. Defaults to :py:attr:`base_year`.
@@ -33,9 +34,9 @@ class IndexSeries:
         which the value is the ``initial_value``.
       year_zero (``int``): The zeroth year for growth, i.e. the year
         from which the rates are selected from ``_rates``.
-      _rates (``dict`` of ``int``: ``float``): The growth rates, where
-        the key is the relative start year and the value is the rate to
-        apply.
+      _rates (``dict`` of ``int``: ``float`` or
+        :py:class:`~.RateBands`): The growth rates, where the key is
+        the relative start year and the value is the rate to apply.
       _initial_rate (``float``): The growth rate corresponding to the
         first year in the ``rates`` dictionary.
       _final_rate (``float``): The growth rate corresponding to the
@@ -46,7 +47,6 @@ class IndexSeries:
     """
     def __init__(self, base_year, rates, initial_value, year_zero=None):
         self.base_year = base_year
-        self._rates = rates.copy()
         if year_zero is None:
             year_zero = base_year
         self.year_zero = year_zero
@@ -58,7 +58,11 @@ class IndexSeries:
     def __getitem__(self, year):
         year -= self.year_zero
         if year not in self._values:
-            self._extend_values(year)
+            if instrumentation.ENABLED:
+                with instrumentation.timed(__name__, "extend_values"):
+                    self._extend_values(year)
+            else:
+                self._extend_values(year)
         return self._values[year]
 
     def __iter__(self):
@@ -80,26 +84,16 @@ class IndexSeries:
                 self.year_zero == other.year_zero and
                 self._rates == other._rates)
 
-    @staticmethod
-    def _infill_rates(rates, initial_rate=None):
-        """Fill in the rates dictionary, in-place, to cover all years.
-
-        Arguments:
-          rates (``dict``): The rates dictionary to fill in.
-          initial_rate (``float``, optional): The value to use for
-            years prior to the first year in ``rates``.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        initial = self.base_year - self.year_zero
+        state["_values"] = {initial: self._values[initial]}
+        state["_hash"] = None
+        return state
 
-        """
-        if initial_rate is None:
-            initial_rate = rates[min(rates)]
-        min_year = min(rates)
-        max_year = max(rates)
-        rate = initial_rate
-        for year in range(min_year, max_year):
-            if year in rates:
-                rate = rates[year]
-            else:
-                rates[year] = rate
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._extend_values(0)
 
     def get(self, year, default=None):
         """Retrieve value or supplied default for given year.
@@ -130,6 +124,30 @@ class IndexSeries:
         """
         return self._rates[year]
 
+    def first_rate_difference(self, other):
+        """The first relative year in which the rates differ.
+
+        Rates are compared over every year defined in either series,
+        following the same lookup rules as growth (i.e. missing years
+        are zero, unless the rates extend beyond the defined years).
+
+        Arguments:
+          other (:py:class:`IndexSeries`): The series to compare to.
+
+        Returns:
+          int or None: The first relative year with a different rate,
+            or ``None`` if all of the rates are the same.
+
+        """
+        # pylint: disable=protected-access
+        years = sorted(set(self._rates) | set(other._rates))
+        if type(self._rates) is not type(other._rates):
+            return years[0] if years else None
+        for year in years:
+            if self._rates.get(year, 0.0) != other._rates.get(year, 0.0):
+                return year
+        return None
+
     def _extend_values(self, year):
         """Extend the values dictionary to cover the specified year."""
         raise NotImplementedError
@@ -0,0 +1,208 @@
+"""Generic functionality for series of values keyed by year."""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class ValueSeries:
+    """Values keyed by year, held in sorted arrays.
+
+    Lookups follow the same rules as :py:class:`~.ExtendedDict`: years
+    after the last year take the last value, years before the first
+    year take the first value, and missing years within the range
+    raise a ``KeyError``.
+
+    Arguments:
+      values (``dict`` of ``int``: ``float``): The values, keyed by
+        year.
+
+    """
+
+    def __init__(self, values):
+        years = sorted(values)
+        self._years = array("l", years)
+        self._values = array("d", (values[year] for year in years))
+
+    @classmethod
+    def from_arrays(cls, years, values):
+        """Create a series from parallel sequences of years and values.
+
+        Arguments:
+          years (sequence of ``int``): The years, in ascending order.
+          values (sequence of ``float``): The value for each year.
+
+        Returns:
+          :py:class:`~.ValueSeries`: A new class instance.
+
+        """
+        series = cls.__new__(cls)
+        series._years = array("l", years)
+        series._values = array("d", values)
+        return series
+
+    def __getitem__(self, year):
+        years = self._years
+        if not years:
+            raise KeyError(year)
+        if year >= years[-1]:
+            return self._values[-1]
+        if year <= years[0]:
+            return self._values[0]
+        index = bisect_left(years, year)
+        if years[index] != year:
+            raise KeyError(year)
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._years)
+
+    def __len__(self):
+        return len(self._years)
+
+    def __eq__(self, other):
+        # pylint: disable=protected-access
+        return (isinstance(other, ValueSeries) and
+                self._years == other._years and
+                self._values == other._values)
+
+    def __hash__(self):
+        return hash((tuple(self._years), tuple(self._values)))
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__,
+                                 list(self.items()))
+
+    def get(self, year, default=None):
+        """Retrieve value or supplied default for given year.
+
+        Arguments:
+          year (``int``): The year to retrieve the value for.
+          default (``float`` or ``None``, optional): The value to
+            return if retrieval fails. Defaults to ``None``.
+
+        Returns:
+          ``float`` or ``None``: The retrieved or ``default`` value.
+
+        """
+        try:
+            return self.__getitem__(year)
+        except KeyError:
+            return default
+
+    def items(self):
+        """The ``(year, value)`` pairs, in ascending year order.
+
+        Returns:
+          iterator of ``tuple``: The year and value pairs.
+
+        """
+        return zip(self._years, self._values)
+
+
+class RateBands:
+    """Rates held as sorted, run-length bands.
+
+    Each band's rate applies from its start year until the start of the
+    next band. The first band also applies to every earlier year, and
+    the last to every later year. Lookups therefore give the same rates
+    as an :py:class:`~.ExtendedDict` of rates filled in for every year
+    between the first and last keys, without storing each year.
+
+    Adjacent bands with equal rates are merged, so equivalent rates
+    always have the same bands.
+
+    Arguments:
+      rates (``dict`` of ``int``: ``float``): The rates, keyed by the
+        year from which each applies.
+
+    """
+
+    def __init__(self, rates):
+        years = sorted(rates)
+        self._set_bands(years, [rates[year] for year in years])
+
+    @classmethod
+    def from_arrays(cls, starts, rates):
+        """Create bands from parallel sequences of start years and rates.
+
+        Arguments:
+          starts (sequence of ``int``): The start years, in ascending
+            order.
+          rates (sequence of ``float``): The rate for each start year.
+
+        Returns:
+          :py:class:`~.RateBands`: A new class instance.
+
+        """
+        bands = cls.__new__(cls)
+        bands._set_bands(starts, rates)
+        return bands
+
+    def _set_bands(self, years, rates):
+        """Set the bands, merging adjacent years with equal rates."""
+        starts, values = [], []
+        for year, rate in zip(years, rates):
+            if not values or rate != values[-1]:
+                starts.append(year)
+                values.append(rate)
+        self._starts = tuple(starts)
+        self._rates = tuple(values)
+
+    def __getitem__(self, year):
+        if not self._starts:
+            raise KeyError(year)
+        index = bisect_right(self._starts, year) - 1
+        return self._rates[max(index, 0)]
+
+    def __iter__(self):
+        return iter(self._starts)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __eq__(self, other):
+        # pylint: disable=protected-access
+        return (isinstance(other, RateBands) and
+                self._starts == other._starts and
+                self._rates == other._rates)
+
+    def __hash__(self):
+        return hash((self._starts, self._rates))
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__,
+                                 dict(self.items()))
+
+    def copy(self):
+        """The bands are immutable, so are returned unchanged.
+
+        Returns:
+          :py:class:`~.RateBands`: This instance.
+
+        """
+        return self
+
+    def get(self, year, default=None):
+        """Retrieve rate or supplied default for given year.
+
+        Arguments:
+          year (``int``): The year to retrieve the rate for.
+          default (``float`` or ``None``, optional): The value to
+            return if there are no bands. Defaults to ``None``.
+
+        Returns:
+          ``float`` or ``None``: The retrieved or ``default`` value.
+
+        """
+        try:
+            return self.__getitem__(year)
+        except KeyError:
+            return default
+
+    def items(self):
+        """The ``(start_year, rate)`` pairs, in ascending year order.
+
+        Returns:
+          iterator of ``tuple``: The start year and rate of each band.
+
+        """
+        return zip(self._starts, self._rates)
@@ -2,6 +2,8 @@
 
 from functools import wraps
 
+from . import instrumentation
+
 def memo(func):
     """Memoizing decorator for caching function results.
 
@@ -19,6 +21,8 @@ def memo(func):
     def wrapper(*args):
         """Function returned by decorator."""
         if args not in wrapper.cache:
+            if instrumentation.ENABLED:
+                instrumentation.count(func.__module__, "memo_miss")
             wrapper.cache[args] = func(*args)
         return wrapper.cache[args]
     wrapper.cache = {}
@@ -0,0 +1,153 @@
+"""Opt-in counters and timers for the :py:mod:`py_wlc` hot paths.
+
+Instrumentation is disabled by default. Call sites check the
+module-level :py:data:`ENABLED` flag before recording anything, so the
+cost when disabled is a single attribute lookup. Events are recorded
+against the ``__name__`` of the module in which they occur, and can be
+emitted through the matching logger in the ``py_wlc`` hierarchy.
+
+Example::
+
+    with instrumentation.measure() as counters:
+        run_appraisal()
+    counters["py_wlc.generic.growth"]["extend_values"]["count"]
+
+Note:
+  Counters are process-wide; measurements scoped with
+  :py:func:`measure` include events from any concurrently running
+  threads.
+
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+import logging
+import time
+
+ENABLED = False
+"""Whether events are currently being recorded."""
+
+_COUNTS = defaultdict(int)
+_TIMES = defaultdict(float)
+
+
+def enable():
+    """Start recording events."""
+    global ENABLED  # pylint: disable=global-statement
+    ENABLED = True
+
+
+def disable():
+    """Stop recording events."""
+    global ENABLED  # pylint: disable=global-statement
+    ENABLED = False
+
+
+def reset():
+    """Discard all recorded events."""
+    _COUNTS.clear()
+    _TIMES.clear()
+
+
+def count(module, event, number=1):
+    """Record occurrences of an event.
+
+    Arguments:
+      module (``str``): The name of the module the event occurred in.
+      event (``str``): The name of the event.
+      number (``int``, optional): The number of occurrences. Defaults
+        to ``1``.
+
+    """
+    _COUNTS[module, event] += number
+
+
+@contextmanager
+def timed(module, event):
+    """Record an occurrence of an event and the time spent in it.
+
+    Arguments:
+      module (``str``): The name of the module the event occurred in.
+      event (``str``): The name of the event.
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _COUNTS[module, event] += 1
+        _TIMES[module, event] += time.perf_counter() - start
+
+
+def snapshot():
+    """The events recorded so far.
+
+    Returns:
+      ``dict``: The count and total time (in seconds) of each event,
+        as ``{module: {event: {"count": ..., "time": ...}}}``.
+
+    """
+    out = {}
+    for (module, event), number in list(_COUNTS.items()):
+        out.setdefault(module, {})[event] = {
+            "count": number, "time": _TIMES.get((module, event), 0.0)}
+    return out
+
+
+def log_snapshot(counters=None, level=logging.DEBUG):
+    """Emit counters through the ``py_wlc`` logger hierarchy.
+
+    Each module's counters are logged to the logger of that module,
+    e.g. ``py_wlc.generic.growth``.
+
+    Arguments:
+      counters (``dict``, optional): The counters to log, as returned
+        by :py:func:`snapshot`. Defaults to the current snapshot.
+      level (``int``, optional): The logging level. Defaults to
+        ``logging.DEBUG``.
+
+    """
+    if counters is None:
+        counters = snapshot()
+    for module, events in sorted(counters.items()):
+        logger = logging.getLogger(module)
+        for event, values in sorted(events.items()):
+            logger.log(level, "%s: count=%d time=%.6fs", event,
+                       values["count"], values["time"])
+
+
+@contextmanager
+def measure(log=False):
+    """Record the events occurring within a block.
+
+    Instrumentation is enabled for the duration of the block and then
+    restored to its previous state.
+
+    Arguments:
+      log (``bool``, optional): Whether to emit the block's counters
+        via :py:func:`log_snapshot` on exit. Defaults to ``False``.
+
+    Yields:
+      ``dict``: Filled in on exit with the events recorded within the
+        block, in the format returned by :py:func:`snapshot`.
+
+    """
+    was_enabled = ENABLED
+    before = snapshot()
+    counters = {}
+    enable()
+    try:
+        yield counters
+    finally:
+        if not was_enabled:
+            disable()
+        for module, events in snapshot().items():
+            for event, values in events.items():
+                prior = before.get(module, {}).get(
+                    event, {"count": 0, "time": 0.0})
+                number = values["count"] - prior["count"]
+                if number:
+                    counters.setdefault(module, {})[event] = {
+                        "count": number,
+                        "time": values["time"] - prior["time"]}
+        if log:
+            log_snapshot(counters)
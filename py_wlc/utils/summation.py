@@ -0,0 +1,146 @@
+"""Exact summation of floating point values.
+
+Naive accumulation of floats gives totals that depend on the order of
+summation, so the same portfolio totalled in different chunks (or on
+different numbers of processes) can differ in the last few bits.
+:py:class:`ExactSum` instead holds the exact sum of everything added to
+it, as a short list of non-overlapping partials (as in Shewchuk's
+algorithm, used internally by :py:func:`math.fsum`), and reports it
+correctly rounded. The total is therefore independent of the order in
+which values are added and of how accumulators are merged.
+
+Single values and other accumulators' partials are added to the
+partials one at a time. Bulk :py:meth:`ExactSum.update` instead uses
+:py:func:`math.fsum` (which is implemented in C) once for the correctly
+rounded total and once for the residual left by rounding it, so each
+value is only visited by two C-level passes rather than by Python code.
+The residual is itself exact unless the magnitudes added span more
+than about 2**106 (e.g. ``1e-20`` alongside ``1e20``), far beyond the
+range of any appraisal's costs.
+
+As with :py:func:`sum`, a mix of ``inf`` and ``-inf`` gives ``nan``.
+
+"""
+from itertools import chain
+import math
+
+
+def _grow(partials, value):
+    """Add a value to a list of non-overlapping partials, in place.
+
+    Arguments:
+      partials (``list`` of ``float``): The partials, in increasing
+        order of magnitude.
+      value (``float``): The (finite) value to add.
+
+    Raises:
+      OverflowError: If an intermediate sum overflows.
+
+    """
+    index = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        if math.isinf(high):
+            raise OverflowError("Intermediate overflow in ExactSum.")
+        low = partial - (high - value)
+        if low:
+            partials[index] = low
+            index += 1
+        value = high
+    partials[index:] = [value] if value else []
+
+
+def _fsum(values):
+    """:py:func:`math.fsum`, but giving ``nan`` for ``inf`` - ``inf``.
+
+    Arguments:
+      values (iterable of ``float``): The values to add.
+
+    Returns:
+      ``float``: The correctly rounded sum.
+
+    """
+    try:
+        return math.fsum(values)
+    except ValueError:
+        return math.nan
+
+
+class ExactSum:
+    """Accumulator for the exact sum of floating point values.
+
+    Arguments:
+      values (iterable of ``float``, optional): The initial values to
+        add. Defaults to none.
+
+    Attributes:
+      partials (``list`` of ``float``): Non-overlapping values whose
+        exact sum is the exact sum of everything added, in increasing
+        order of magnitude.
+
+    Example:
+
+      >>> total = ExactSum([1e16, 1.0, -1e16])
+      >>> total.update([0.1] * 10)
+      >>> float(total)
+      2.0
+
+    """
+
+    BULK = 8
+    """The number of values above which :py:meth:`update` uses
+    :py:func:`math.fsum` rather than adding each value in turn."""
+
+    def __init__(self, values=()):
+        self.partials = []
+        self.update(values)
+
+    def update(self, values):
+        """Add every value in an iterable to the sum.
+
+        Arguments:
+          values (iterable of ``float``): The values to add.
+
+        """
+        if not isinstance(values, list):
+            values = list(values)
+        partials = self.partials
+        if len(values) <= self.BULK:
+            if not all(map(math.isfinite, chain(partials, values))):
+                self.partials = [_fsum(chain(partials, values))]
+                return
+            for value in values:
+                _grow(partials, value)
+            return
+        total = _fsum(chain(partials, values))
+        if not math.isfinite(total):
+            self.partials = [total]
+            return
+        residual = math.fsum(chain(partials, values, (-total,)))
+        self.partials = [residual, total] if residual else [total]
+
+    def add(self, value):
+        """Add a single value to the sum.
+
+        Arguments:
+          value (``float``): The value to add.
+
+        """
+        self.update((value,))
+
+    def merge(self, other):
+        """Add the sum held by another accumulator to this one.
+
+        Arguments:
+          other (:py:class:`ExactSum`): The accumulator to merge.
+
+        """
+        self.update(list(other.partials))
+
+    def __float__(self):
+        return math.fsum(self.partials)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.partials)
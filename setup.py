@@ -1,6 +1,6 @@
 import io
 import os
-from setuptools import setup
+from setuptools import find_packages, setup
 from setuptools.command.test import test as TestCommand
 import sys
 
@@ -36,7 +36,12 @@ class PyTest(TestCommand):
 
 setup(author='Jonathan Sharpe',
       author_email='j.r.sharpe@gmail.com',
-      classifiers=['Programming Language :: Python :: 3.4',
+      classifiers=['Programming Language :: Python :: 3.7',
+                   'Programming Language :: Python :: 3.8',
+                   'Programming Language :: Python :: 3.9',
+                   'Programming Language :: Python :: 3.10',
+                   'Programming Language :: Python :: 3.11',
+                   'Programming Language :: Python :: 3.12',
                    'Programming Language :: Python :: 3 :: Only',
                    'Development Status :: 2 - Pre-Alpha',
                    'Natural Language :: English',
@@ -44,15 +49,19 @@ setup(author='Jonathan Sharpe',
                    'Topic :: Scientific/Engineering'],
       cmdclass={'test': PyTest},
       description='Functionality for whole-life costing in Python',
-      extras_require={'testing': ['pytest']},
+      extras_require={'synthetic': ['xlwt'], 'testing': ['pytest']},
       include_package_data=True,
       install_requires=['xlrd>=0.9.3'],
       license='License :: OSI Approved :: MIT License',
       long_description=long_description,
       name='py_wlc',
-      packages=['py_wlc'],
+      packages=find_packages(exclude=['tests', 'tests.*',
+                                      'benchmarks', 'benchmarks.*']),
       platforms='any',
-      scripts=['py_wlc/data/webtag_parser.py'],
+      python_requires='>=3.7',
+      entry_points={'console_scripts': [
+          'webtag_parser = py_wlc.data.webtag_parser:main',
+      ]},
       test_suite='py_wlc.test.test_py_wlc',
       tests_require=['pytest'],
       url='http://github.com/textbook/py_wlc/',
@@ -0,0 +1,65 @@
+from collections import Counter
+import datetime
+import json
+import os
+
+import pytest
+
+from py_wlc.data import WebTagData, WebTagParser
+from py_wlc.data.synthetic import SyntheticDatabook, cost_portfolio
+from py_wlc.economics import Cost
+
+
+def round_trip(data):
+    return json.loads(json.dumps(data))
+
+
+class TestSyntheticDatabook:
+
+    def test_deterministic(self):
+        assert SyntheticDatabook(1).series == SyntheticDatabook(1).series
+        assert SyntheticDatabook(1).series != SyntheticDatabook(2).series
+
+    def test_parser(self):
+        databook = SyntheticDatabook(years=50)
+        with WebTagParser("synthetic.xls", databook.book()) as parser:
+            assert parser.version == "Synthetic"
+            assert parser.date == datetime.date(2014, 12, 1)
+            assert parser.base_year == 2010
+            extracted = parser.extract_all()
+        assert round_trip(extracted) == round_trip(databook.extract())
+
+    def test_json(self, tmpdir):
+        file = str(tmpdir.join("synthetic.json"))
+        SyntheticDatabook(years=50).write_json(file)
+        data = WebTagData.from_json(file)
+        assert data.version == "Synthetic"
+        assert len(list(data.rail_fuel_duty)) == 50
+
+    def test_xls(self, tmpdir):
+        pytest.importorskip("xlwt")
+        file = str(tmpdir.join("synthetic.xls"))
+        databook = SyntheticDatabook(years=20)
+        databook.write_xls(file)
+        with WebTagParser(file) as parser:
+            extracted = parser.extract_all()
+        assert (round_trip(extracted) ==
+                round_trip(databook.extract(os.path.basename(file))))
+
+
+class TestCostPortfolio:
+
+    def test_deterministic(self):
+        assert list(cost_portfolio(100, 3)) == list(cost_portfolio(100, 3))
+        assert list(cost_portfolio(100, 3)) != list(cost_portfolio(100, 4))
+
+    def test_distribution(self):
+        records = list(cost_portfolio(5000, start_year=2010,
+                                      end_year=2069))
+        years = [year for _, _, year, _ in records]
+        assert min(years) >= 2010 and max(years) <= 2069
+        assert sum(year < 2040 for year in years) > len(years) / 2
+        types = Counter(type_ for _, type_, _, _ in records)
+        assert types.most_common(1)[0][0] == Cost.NOMINAL | Cost.FACTOR_COST
+        for _, type_, _, _ in records:
+            Cost.validate_type(type_)
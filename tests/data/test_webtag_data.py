@@ -1,10 +1,15 @@
+import asyncio
 import datetime
+import gc
+import json
 import os
 
 import pytest
 
-from py_wlc.data import WebTagData
+from py_wlc.data import WebTagData, WebTagParser
+from py_wlc.data.webtag_schema import LOCATIONS, SCHEMA, register_series
 from py_wlc.economics import Discount
+from py_wlc.utils import instrumentation
 
 DATA = os.path.join(os.path.dirname(__file__), 'test_data')
 
@@ -16,6 +21,12 @@ def databook():
 def latest_databook():
     return WebTagData.from_latest_json(DATA)
 
+@pytest.fixture()
+def fresh_cache(request):
+    # Start from (and leave behind) an empty registry of shared releases
+    WebTagData.clear_cache()
+    request.addfinalizer(WebTagData.clear_cache)
+
 
 class TestWebTagData():
 
@@ -31,10 +42,140 @@ class TestWebTagData():
         assert latest_databook.version == "Nov 2014 release v1.3b"
 
     def test_discount_parsing(self):
-        data = {"0 to 30": 0.035, "text": None, "31-75": 0.03}
+        data = {"0 to 30": 0.035, "text": None, "31-75": 0.03, "3a": 0.5,
+                "2010/11": 0.5}
         disc = WebTagData._parse_discount(data, 2010)
         assert disc == Discount(2010, {0: 0.035, 31: 0.03})
 
+    def test_value_parsing(self):
+        data = {"2012": 3, "title": "T", "2010": 1.5, "table": "t"}
+        series = WebTagData._parse_values(data, 2010)
+        assert list(series.items()) == [(2010, 1.5), (2012, 3.0)]
+
+    def test_value_parsing_int_keys(self):
+        series = WebTagData._parse_values({2011: 2.0, 2010: 1.0}, 2010)
+        assert list(series.items()) == [(2010, 1.0), (2011, 2.0)]
+
+    def test_deflator_parsing_int_keys(self):
+        data = {2010: 0.01, 2011: 0.02, "title": "T"}
+        assert (WebTagData._parse_deflator(data, 2010) ==
+                WebTagData._parse_deflator({"2010": 0.01, "2011": 0.02},
+                                           2010))
+
+    def test_shared(self, fresh_cache):
+        file = os.path.join(DATA, "old_databook.json")
+        with instrumentation.measure() as counters:
+            data = WebTagData.from_json(file)
+            assert WebTagData.from_json(file) is data
+            view = WebTagData.from_json(file, horizon=20)
+        events = counters["py_wlc.data.webtag_data"]
+        assert events["registry_miss"]["count"] == 1
+        assert events["registry_hit"]["count"] == 2
+        assert data.factors is None
+        assert view.factors.end_year == data.base_year + 20
+        assert view.discount is data.discount
+        for instance in (data, view):
+            with pytest.raises(AttributeError):
+                instance.version = "Edited"
+        with pytest.raises(TypeError):
+            data._data["gdp_growth"] = None
+        del data
+        gc.collect()
+        assert len(WebTagData._SHARED) == 1
+        del view, instance
+        gc.collect()
+        assert len(WebTagData._SHARED) == 0
+
+    def test_shared_edited_file(self, fresh_cache, tmpdir):
+        file = str(tmpdir.join("databook.json"))
+        with open(os.path.join(DATA, "old_databook.json")) as file_:
+            content = json.load(file_)
+        with open(file, "w") as file_:
+            json.dump(content, file_)
+        data = WebTagData.from_json(file)
+        content["gdp_growth"] = {"2010": 0.5}
+        with open(file, "w") as file_:
+            json.dump(content, file_)
+        edited = WebTagData.from_json(file)
+        assert edited is not data
+        assert edited.deflator.rate(1) == 0.5
+        assert WebTagData.from_latest_json(str(tmpdir)) is edited
+
+    def test_private(self, fresh_cache):
+        file = os.path.join(DATA, "old_databook.json")
+        data = WebTagData.from_json(file, shared=False)
+        assert data is not WebTagData.from_json(file)
+        data.version = "Edited"
+        assert data.version == "Edited"
+        latest = WebTagData.from_latest_json(DATA, shared=False)
+        assert latest is not WebTagData.from_latest_json(DATA)
+
     def test_empty_dir(self):
         data = WebTagData.from_latest_json(os.path.join(DATA, "empty"))
         assert data is None
+
+    def test_async_loaders(self, databook):
+        async def load():
+            return (await WebTagData.from_json_async(
+                        os.path.join(DATA, "test_databook.json")),
+                    await WebTagData.from_latest_json_async(DATA))
+        data, latest = asyncio.run(load())
+        assert data.version == latest.version == databook.version
+        assert data.discount == databook.discount
+
+    def test_horizon(self, databook, fresh_cache):
+        assert databook.factors is None
+        data = WebTagData.from_json(os.path.join(DATA, "test_databook.json"),
+                                    horizon=60)
+        assert data.factors.start_year == 2010
+        assert data.factors.end_year == 2070
+        assert len(data.discount) == 61
+        assert data.factors.factors(2030)[0] == data.discount[2030]
+        assert databook.factors is None
+
+    def test_all_series(self, databook):
+        assert (sorted(WebTagData.available_series()) ==
+                sorted(WebTagParser.LOCATIONS))
+        assert databook.series("gdp_growth") is databook.deflator
+        assert databook.rail_diesel_price[2030] == 53.14620972107164
+        assert databook.rail_diesel_price[2200] == 53.14620972107164
+        assert databook.rail_fuel_duty is databook.series("rail_fuel_duty")
+        with pytest.raises(AttributeError):
+            _ = databook.not_a_series
+        with pytest.raises(KeyError):
+            databook.series("not_a_series")
+
+    def test_missing_series(self):
+        data = WebTagData(2010, "2014-12-01", "", "")
+        assert data.rail_diesel_price is None
+        assert data.deflator[2020] == 1.0
+
+    def test_set_factors(self):
+        data = WebTagData(2010, "2014-12-01", "", "")
+        data.discount = Discount(2010, {0: 0.05})
+        data.deflator = None
+        assert data.series("discount_rate").rate(1) == 0.05
+        assert data.deflator is None
+
+    def test_series_name_clash(self):
+        register_series("version", "Sheet", 1, 2, 3)
+        try:
+            data = object.__new__(WebTagData)
+            data._data, data._series = {"version": {"2010": 1}}, {}
+            with pytest.raises(AttributeError):
+                _ = data.version
+        finally:
+            del SCHEMA["version"], LOCATIONS["version"]
+
+    def test_register_series(self):
+        assert "extra" not in WebTagParser.LOCATIONS
+        register_series("extra", "Sheet", 1, 2, 3)
+        try:
+            assert WebTagParser.LOCATIONS["extra"] == ("Sheet", 1, 2, 3)
+            data = WebTagData(2010, "2014-12-01", "", "",
+                              extra={"2010": 1, "title": "Extra"})
+            assert data.extra[2010] == 1.0
+        finally:
+            del SCHEMA["extra"], LOCATIONS["extra"]
+        with pytest.raises(ValueError):
+            register_series("extra", "Sheet", 1, 2, 3, "unknown")
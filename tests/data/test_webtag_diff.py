@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from py_wlc.data import WebTagData, WebTagDiff
+from py_wlc.data.synthetic import SyntheticDatabook, cost_portfolio
+from py_wlc.economics import Cost, FactorTable
+from py_wlc.economics.stream import convert_batch
+
+TOLERANCE = 0.0001
+
+
+def release(**changes):
+    data = json.loads(json.dumps(SyntheticDatabook(years=80).extract()))
+    for name, values in changes.items():
+        data[name].update(values)
+    return WebTagData(**data)
+
+@pytest.fixture(scope="module")
+def old():
+    return release()
+
+@pytest.fixture(scope="module")
+def schemes():
+    return {"a": list(cost_portfolio(200, seed=1)),
+            "b": list(cost_portfolio(200, seed=2))}
+
+
+class TestWebTagDiff:
+
+    def test_unchanged(self, old, schemes):
+        diff = WebTagDiff(old, release(), 2010, 2069)
+        assert diff.changes == {}
+        assert diff.first_year is None
+        for scheme in diff.report(schemes).values():
+            assert scheme.affected == 0
+            assert scheme.delta == 0.0
+
+    def test_growth_change(self, old, schemes):
+        new = release(gdp_growth={"2040": 0.05, "2041": 0.05})
+        diff = WebTagDiff(old, new, 2010, 2069)
+        assert diff.changes == {"gdp_growth": 2041}
+        assert diff.first_year == 2041
+        full = FactorTable(new.discount, new.deflator, 2010, 2069)
+        assert diff.new_factors.discount == full.discount
+        assert diff.new_factors.deflation == full.deflation
+        assert diff.new_factors.real_pv == full.real_pv
+        report = diff.report(schemes)
+        for name, records in schemes.items():
+            expected = (
+                sum(convert_batch(records, Cost.PRESENT_VALUE,
+                                  new.discount, new.deflator)) -
+                sum(convert_batch(records, Cost.PRESENT_VALUE,
+                                  old.discount, old.deflator))
+            )
+            assert abs(report[name].delta - expected) < TOLERANCE
+            assert report[name].records == len(records)
+            assert report[name].affected == len(
+                [record for record in records if record[2] >= 2041]
+            )
+
+    def test_discount_change(self, old):
+        new = release(discount_rate={"31-75": 0.04})
+        assert WebTagDiff(old, new, 2010, 2069).changes == {
+            "discount_rate": 2041
+        }
+        assert WebTagDiff(old, new, 2010, 2030).changes == {}
+
+    def test_values_change(self, old):
+        new = release(rail_fuel_duty={"2050": 1.0})
+        diff = WebTagDiff(old, new, 2010, 2069)
+        assert diff.changes == {"rail_fuel_duty": 2050}
+        assert diff.first_year is None
+
+    def test_base_year_change(self, old):
+        data = json.loads(json.dumps(SyntheticDatabook(years=80).extract()))
+        data["base_year"] = 2012
+        diff = WebTagDiff(old, WebTagData(**data), 2010, 2069)
+        assert diff.changes["discount_rate"] == 2010
+        assert diff.changes["gdp_growth"] == 2010
+
+    def test_failure(self, old):
+        with pytest.raises(ValueError):
+            WebTagDiff(old, old, 2010, 2009)
+        with pytest.raises(ValueError):
+            WebTagDiff(old, old, 2010, 2069).report(
+                {"a": [(1, Cost.NOMINAL, 2070, 1)]}
+            )
@@ -0,0 +1,48 @@
+import asyncio
+import os
+
+import pytest
+
+from py_wlc.data import WebTagData, WebTagHolder
+
+DATA = os.path.join(os.path.dirname(__file__), 'test_data')
+
+@pytest.fixture()
+def old_data():
+    return WebTagData.from_json(os.path.join(DATA, "old_databook.json"))
+
+
+class TestWebTagHolder:
+
+    def test_empty(self):
+        assert WebTagHolder().data is None
+
+    def test_swap(self, old_data):
+        holder = WebTagHolder(old_data)
+        new_data = WebTagData.from_json(os.path.join(DATA,
+                                                     "test_databook.json"))
+        assert holder.swap(new_data)
+        assert holder.data is new_data
+        assert not holder.swap(old_data)
+        assert holder.data is new_data
+        assert holder.swap(old_data, force=True)
+        assert holder.data is old_data
+
+    def test_snapshot(self, old_data):
+        holder = WebTagHolder(old_data)
+        snapshot = holder.data
+        holder.refresh(DATA)
+        assert snapshot is old_data
+        assert snapshot.version == "Fake for testing"
+        assert holder.data.version == "Nov 2014 release v1.3b"
+
+    def test_refresh(self, old_data):
+        holder = WebTagHolder(old_data)
+        assert not holder.refresh(os.path.join(DATA, "empty"))
+        assert holder.refresh(DATA)
+        assert not holder.refresh(DATA)
+
+    def test_refresh_async(self, old_data):
+        holder = WebTagHolder(old_data)
+        assert asyncio.run(holder.refresh_async(DATA))
+        assert holder.data.version == "Nov 2014 release v1.3b"
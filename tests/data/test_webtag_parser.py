@@ -1,10 +1,16 @@
+import gzip
+import io
 import json
 import os
+import subprocess
+import sys
 
 import pytest
+import xlrd
 
 from py_wlc.data import WebTagParser
-from py_wlc.data.webtag_parser import cli, parse_args
+from py_wlc.data.synthetic import SyntheticDatabook
+from py_wlc.data.webtag_parser import cli, main, parse_args, write_json
 
 DATA = os.path.join(os.path.dirname(__file__), "test_data")
 DATABOOK = os.path.join(DATA, "test_databook.xls")
@@ -28,6 +34,8 @@ def args(request):
     args.verbose = False
     args.file = DATABOOK
     args.o = TEMPFILE
+    args.compact = False
+    args.gzip = False
     # Handle file clean-up
     def clean_up():
         if os.path.exists(TEMPFILE):
@@ -53,6 +61,70 @@ class TestWebTagParser():
     def test_setup(self, parser):
         assert parser.version == "Nov 2014 release v1.3b"
 
+    def test_open_book(self):
+        book = xlrd.open_workbook(DATABOOK, on_demand=True)
+        with WebTagParser("other.xls", book) as parser:
+            assert parser.book is book
+            assert parser.extract_all()["source"] == "other.xls"
+
+    def test_lazy_metadata(self):
+        with WebTagParser(DATABOOK) as parser:
+            assert parser._date is None and parser._base_year is None
+            assert parser.base_year == 2010
+            assert str(parser.date) == "2014-12-01"
+
+    def test_probe(self):
+        with open(DATABOOK, "rb") as file:
+            contents = file.read()
+        version = "Nov 2014 release v1.3b"
+        assert WebTagParser.probe(DATABOOK) == version
+        assert WebTagParser.probe(contents) == version
+        assert WebTagParser.probe(io.BytesIO(contents)) == version
+        with open(DATABOOK, "rb") as file:
+            with WebTagParser(file) as parser:
+                assert parser.filename == DATABOOK
+        with WebTagParser(contents) as parser:
+            assert parser.extract_all()["source"] is None
+        with open(os.path.join(DATA, "not_databook.xls"), "rb") as file:
+            with pytest.raises(IOError):
+                WebTagParser.probe(file.read())
+        with pytest.raises(IOError):
+            WebTagParser.probe(b"not a workbook")
+
+    def test_stops_at_empty_row(self):
+        book = SyntheticDatabook(years=10).book()
+        sheet_name, start_row, key_col, value_col = \
+            WebTagParser.LOCATIONS["gdp_growth"]
+        sheet = book.sheet(sheet_name)
+        sheet.set(start_row + 11, key_col, "Notes")
+        sheet.set(start_row + 11, value_col, "Not data")
+        with WebTagParser("synthetic.xls", book) as parser:
+            data = parser.extract_named_data("gdp_growth")
+            assert parser.base_year == 2010
+        assert "Notes" not in data
+        assert sorted(key for key in data if isinstance(key, int)) == list(
+            range(2010, 2020)
+        )
+
+    def test_one_snapshot_per_sheet(self, monkeypatch):
+        synthetic = SyntheticDatabook(years=10)
+        book = synthetic.book()
+        loads, reads = [], []
+        sheet_by_name = book.sheet_by_name
+        monkeypatch.setattr(book, "sheet_by_name",
+                            lambda name: loads.append(name) or
+                            sheet_by_name(name))
+        sheet = book.sheet("A1.3.7")
+        cell_value = sheet.cell_value
+        monkeypatch.setattr(sheet, "cell_value",
+                            lambda row, col: reads.append(col) or
+                            cell_value(row, col))
+        with WebTagParser("synthetic.xls", book) as parser:
+            data = dict(parser.iter_extract())
+        assert loads.count("A1.3.7") == 1
+        assert reads.count(1) == 10
+        assert data == synthetic.extract()
+
 
 class TestParserCli():
 
@@ -72,9 +144,73 @@ class TestParserCli():
         with pytest.raises(ValueError):
             cli(args)
 
-    def test_pipe(self, args):
+    def test_pipe(self, args, capsys):
         args.o = None
         assert cli(args) is None
+        assert json.loads(capsys.readouterr().out)["version"]
+
+    def test_failure_keeps_output(self, args, monkeypatch):
+        with open(TEMPFILE, "w") as temp:
+            temp.write("previous")
+        def iter_extract(self, verbose=False):
+            yield "version", "partial"
+            raise IOError("extraction failed")
+        monkeypatch.setattr(WebTagParser, "iter_extract", iter_extract)
+        with pytest.raises(IOError):
+            cli(args)
+        with open(TEMPFILE) as temp:
+            assert temp.read() == "previous"
+        assert not [file for file in os.listdir(DATA)
+                    if file.endswith(".tmp")]
+
+    def test_output_mode(self, args):
+        umask = os.umask(0o022)
+        try:
+            cli(args)
+            assert os.stat(TEMPFILE).st_mode & 0o777 == 0o644
+            os.chmod(TEMPFILE, 0o640)
+            cli(args)
+            assert os.stat(TEMPFILE).st_mode & 0o777 == 0o640
+        finally:
+            os.umask(umask)
+
+    def test_main(self, args):
+        main([DATABOOK, "-o", TEMPFILE, "-c"])
+        with open(TEMPFILE) as temp:
+            assert json.load(temp)["base_year"] == 2010
+
+    def test_run_module(self):
+        result = subprocess.run(
+            [sys.executable, "-W", "error", "-m", "py_wlc.data", DATABOOK,
+             "-c"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        )
+        assert json.loads(result.stdout.decode())["base_year"] == 2010
+        assert not result.stderr
+
+    def test_compact_gzip(self, args):
+        args.compact = True
+        args.gzip = True
+        cli(args)
+        with gzip.open(TEMPFILE, "rt") as temp, open(COMPFILE) as comp:
+            text = temp.read()
+            comp_ = json.load(comp)
+        assert "\n" not in text and ", " not in text
+        temp_ = json.loads(text)
+        for dict_ in (temp_, comp_):
+            dict_.pop("source")
+        assert temp_ == comp_
+
+    @pytest.mark.parametrize("indent", [None, 4])
+    def test_write_json(self, indent):
+        items = [("a", {"2010": [1, 2]}), ("b", "text"), (2010, None)]
+        out = io.StringIO()
+        write_json(iter(items), out, indent)
+        if indent is None:
+            expected = json.dumps(dict(items), separators=(",", ":"))
+        else:
+            expected = json.dumps(dict(items), indent=indent)
+        assert out.getvalue() == expected
 
 
 class TestArgParsing():
@@ -100,3 +236,10 @@ class TestArgParsing():
         assert not args_.verbose
         assert args_.file == "infile"
         assert args_.o is None
+        assert not args_.compact
+        assert not args_.gzip
+
+    def test_format(self):
+        args_ = parse_args(['infile', '-c', '-z'])
+        assert args_.compact
+        assert args_.gzip
@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from py_wlc.data import WebTagData, WebTagHolder, WebTagWatcher
+from py_wlc.data import webtag_watcher
+
+DATA = os.path.join(os.path.dirname(__file__), 'test_data')
+
+@pytest.fixture()
+def watched(tmpdir):
+    shutil.copy(os.path.join(DATA, "very_old_databook.json"), str(tmpdir))
+    return str(tmpdir)
+
+
+def write_release(dir_, name, released):
+    with open(os.path.join(DATA, "old_databook.json")) as file_:
+        data = json.load(file_)
+    data["released"] = released
+    with open(os.path.join(dir_, name), "w") as file_:
+        json.dump(data, file_)
+
+
+class TestWebTagWatcher:
+
+    def test_initial_poll(self, watched):
+        published = []
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.subscribe(published.append)
+        data = watcher.poll()
+        assert str(data.released) == "2010-12-01"
+        assert published == [data]
+        assert watcher.poll() is None
+
+    def test_newer_release(self, watched):
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.poll()
+        write_release(watched, "older.json", "2009-01-01")
+        assert watcher.poll() is None
+        write_release(watched, "newer.json", "2013-12-01")
+        assert str(watcher.poll().released) == "2013-12-01"
+
+    def test_incremental(self, watched):
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.poll()
+        os.remove(os.path.join(watched, "very_old_databook.json"))
+        write_release(watched, "newer.json", "2013-12-01")
+        assert watcher.poll() is not None
+        assert list(watcher._seen) == [os.path.join(watched, "newer.json")]
+
+    def test_debounce(self, watched):
+        watcher = WebTagWatcher(watched, settle=60)
+        assert watcher.poll() is None
+        assert watcher._pending
+
+    def test_partial_write(self, watched):
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.poll()
+        with open(os.path.join(watched, "partial.json"), "w") as file_:
+            file_.write('{"released": "2015-')
+        assert watcher.poll() is None
+        write_release(watched, "partial.json", "2015-01-01")
+        assert str(watcher.poll().released) == "2015-01-01"
+
+    def test_retry_failed_load(self, watched, monkeypatch):
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.poll()
+        partial = os.path.join(watched, "partial.json")
+        with open(partial, "w") as file_:
+            file_.write('{"released": "2015-')
+        assert watcher.poll() is None
+        assert partial not in watcher._seen
+        loads = []
+        load = webtag_watcher.json.loads
+        monkeypatch.setattr(webtag_watcher.json, "loads",
+                            lambda text, **kwargs: loads.append(text) or
+                            load(text, **kwargs))
+        assert watcher.poll() is None
+        assert not loads
+        write_release(watched, "partial.json", "2015-01-01")
+        del loads[:]
+        assert str(watcher.poll().released) == "2015-01-01"
+        assert len(loads) == 1
+
+    def test_retry_failed_publish(self, watched, monkeypatch):
+        watcher = WebTagWatcher(watched, settle=0)
+        def fail(data, **kwargs):
+            raise ValueError("bad release")
+        monkeypatch.setattr(WebTagData, "shared", fail)
+        with pytest.raises(ValueError):
+            watcher.poll()
+        assert not watcher._seen
+        monkeypatch.undo()
+        assert str(watcher.poll().released) == "2010-12-01"
+
+    def test_failing_subscriber(self, watched):
+        published = []
+        def fail(data):
+            raise RuntimeError("subscriber failed")
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.subscribe(fail)
+        watcher.subscribe(published.append)
+        data = watcher.poll()
+        assert published == [data]
+
+    def test_unsubscribe(self, watched):
+        published = []
+        watcher = WebTagWatcher(watched, settle=0)
+        watcher.subscribe(published.append)
+        watcher.unsubscribe(published.append)
+        watcher.poll()
+        assert not published
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_background(self, watched, use_inotify):
+        holder = WebTagHolder()
+        watcher = WebTagWatcher(watched, interval=0.05, settle=0,
+                                use_inotify=use_inotify)
+        watcher.subscribe(holder.swap)
+        with watcher:
+            write_release(watched, "newer.json", "2013-12-01")
+            for _ in range(100):
+                if (holder.data is not None and
+                        str(holder.data.released) == "2013-12-01"):
+                    break
+                time.sleep(0.05)
+        assert str(holder.data.released) == "2013-12-01"
@@ -94,4 +94,48 @@ class TestMethods:
             cost2 <= cost1
         with pytest.raises(TypeError):
             cost2 >= cost1
-        assert cost1 != cost2
\ No newline at end of file
+        assert cost1 != cost2
+
+
+class TestConversionMatrix:
+
+    def test_all_types(self, discount, deflator):
+        costs = [Cost(100, Cost.NOMINAL, 2011, discount, deflator, 1.19),
+                 Cost(50, Cost.PRESENT_VALUE, 2030, discount, deflator, 1),
+                 Cost(75, Cost.REAL | Cost.MARKET_PRICE, 2011,
+                      discount, deflator, 1.2)]
+        rows = Cost.conversion_matrix(costs)
+        assert len(rows) == 3
+        for cost, row in zip(costs, rows):
+            assert len(row) == len(Cost.TYPES)
+            for type_, value in zip(Cost.TYPES, row):
+                assert cost.as_type(type_) == value
+
+    def test_selected_types(self, discount, deflator):
+        cost = Cost(100, Cost.NOMINAL, 2011, discount, deflator, 1.19)
+        assert Cost.conversion_matrix([cost], (Cost.MARKET_PRICE,)) == [
+            [cost.as_type(Cost.MARKET_PRICE)]]
+        assert Cost.conversion_matrix([]) == []
+
+    def test_invalid_type(self, discount, deflator):
+        with pytest.raises(ValueError):
+            Cost.conversion_matrix([], (Cost.REAL | Cost.NOMINAL,))
+
+
+class TestTypeTable:
+
+    def test_table(self):
+        assert len(Cost.TYPE_TABLE) == Cost.TYPE_MASK + 1
+        for type_, (error, disc, defl, adj) in enumerate(Cost.TYPE_TABLE):
+            if error is not None:
+                with pytest.raises(ValueError):
+                    Cost.validate_type(type_)
+                continue
+            assert disc == bool(type_ & Cost.PRESENT_VALUE)
+            assert defl == bool(type_ & (Cost.REAL | Cost.PRESENT_VALUE))
+            assert adj == bool(type_ & Cost.MARKET_PRICE)
+
+    def test_high_bits_ignored(self):
+        assert Cost.validate_type(Cost.REAL | 64) is None
+        with pytest.raises(ValueError):
+            Cost.validate_type(Cost.REAL | Cost.NOMINAL | 64)
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from py_wlc.economics import Discount
@@ -36,10 +38,80 @@ class TestStandardDiscount:
         for year in book_two:
             assert year == 0
 
+    def test_bands(self, green_book):
+        assert len(green_book._rates) == len(Discount.RATES)
+        assert green_book.rebase(2014)._rates is green_book._rates
+        assert Discount(2010, {0: 0.035, 10: 0.035, 31: 0.03}) == Discount(
+            2010, {0: 0.035, 31: 0.03}
+        )
+
+    def test_pickle(self, green_book):
+        _ = green_book[2300]
+        data = pickle.dumps(green_book)
+        assert len(data) < 1000
+        restored = pickle.loads(data)
+        assert restored == green_book
+        assert restored[2300] == green_book[2300]
+
+    def test_schedules(self, green_book):
+        assert "green book health" in Discount.available_schedules()
+        assert Discount(2010, "green book") == green_book
+        health = Discount(2010, "green book health")
+        assert health.rate(10) == 0.015 and health.rate(400) == 0.00429
+        with pytest.raises(ValueError):
+            Discount(2010, "no such schedule")
+
+    def test_shared_curve(self):
+        Discount.register_schedule("test", {0: 0.04, 50: 0.02})
+        first = Discount(2010, "test")
+        _ = first[2200]
+        second = Discount(2010, {0: 0.04, 10: 0.04, 50: 0.02})
+        assert second._curve is first._curve
+        assert len(second) == 1 and len(first) == 191
+        assert second[2200] == first[2200]
+        assert Discount(2011, "test")._curve is not first._curve
+        assert Discount(2010, "test", 2012)._curve is None
+        restored = pickle.loads(pickle.dumps(first))
+        assert restored._curve is first._curve
+        assert restored == first and len(restored) == 1
+        with pytest.raises(ValueError):
+            Discount.register_schedule("empty", {})
+        del Discount.SCHEDULES["test"]
+
 
 class TestComplexDiscount:
     """Test complex discounting against DfT RIOC v1.4."""
 
     def test_factor(self, green_book):
         complex_discount = green_book.rebase(2014)
-        assert abs(complex_discount[2160] - 0.0158) < TOLERANCE
\ No newline at end of file
+        assert abs(complex_discount[2160] - 0.0158) < TOLERANCE
+
+    def test_rebase_view(self, green_book):
+        for year_zero in (2000, 2009, 2010, 2011, 2014, 2030):
+            view = green_book.rebase(year_zero)
+            fresh = Discount(2010, Discount.RATES, year_zero)
+            assert view == fresh
+            assert view._root is green_book
+            for year in range(2000, 2400, 7):
+                assert abs(view[year] - fresh[year]) <= 1e-12 * fresh[year]
+                assert view.rate(year - year_zero) == fresh.rate(
+                    year - year_zero
+                )
+            again = view.rebase(2012)
+            assert again._root is green_book
+            assert again[2100] == green_book.rebase(2012)[2100]
+        assert green_book.rebase(2010)[2200] == green_book[2200]
+
+    def test_rebase_lazy(self, green_book):
+        view = green_book.rebase(2400)
+        assert len(view) == 1 and view._scale is None
+        assert view[2300] == Discount(2010, Discount.RATES, 2400)[2300]
+        offset = Discount(2010, "green book", 2014)
+        assert offset.rebase(2020)._root is offset.rebase(2030)._root
+        assert offset.rebase(2020)._root.year_zero == 2010
+
+    def test_rebase_pickle(self, green_book):
+        view = green_book.rebase(2014)
+        restored = pickle.loads(pickle.dumps(view))
+        assert restored == view
+        assert restored[2160] == view[2160]
@@ -0,0 +1,56 @@
+import pytest
+
+from py_wlc.economics import Cost, Discount, FactorTable, GdpDeflator
+
+TOLERANCE = 0.0001
+
+@pytest.fixture(scope="module")
+def discount():
+    return Discount(2010)
+
+@pytest.fixture(scope="module")
+def deflator():
+    return GdpDeflator(2010, {2010: 0.03}, True)
+
+@pytest.fixture(scope="module")
+def table(discount, deflator):
+    return FactorTable(discount, deflator, 2005, 2060)
+
+
+class TestFactorTable:
+
+    def test_materialised(self):
+        discount = Discount(2010)
+        FactorTable(discount, GdpDeflator(2010, {}), 2010, 2060)
+        assert len(discount) == 51
+
+    def test_factors(self, table, discount, deflator):
+        assert len(table) == 56
+        assert 2005 in table and 2060 in table and 2061 not in table
+        for year in (2005, 2010, 2030, 2060):
+            cost = Cost(100, Cost.NOMINAL, year, discount, deflator, 1)
+            assert table.factors(year) == (cost.discount_factor,
+                                           cost.deflation_factor)
+            for type_ in (Cost.NOMINAL, Cost.REAL, Cost.PRESENT_VALUE):
+                assert abs(100 * table.multiplier(year, type_) -
+                           cost.as_type(type_)) < TOLERANCE
+
+    def test_recompute(self, table, discount):
+        rates = {year: 0.03 for year in range(2010, 2030)}
+        rates[2030] = 0.05
+        deflator = GdpDeflator(2010, rates, True)
+        new = table.recompute(discount, deflator, 2031)
+        full = FactorTable(discount, deflator, 2005, 2060)
+        assert new.discount == full.discount
+        assert new.deflation == full.deflation
+        assert new.real_pv == full.real_pv
+        assert new.deflation[:26] == table.deflation[:26]
+        assert new.deflation[26:] != table.deflation[26:]
+
+    def test_failure(self, table, discount, deflator):
+        with pytest.raises(KeyError):
+            table.factors(2061)
+        with pytest.raises(ValueError):
+            table.multiplier(2010, Cost.REAL | Cost.NOMINAL)
+        with pytest.raises(ValueError):
+            FactorTable(discount, deflator, 2010, 2009)
@@ -30,9 +30,51 @@ class TestDeflator:
         for year, val in test.items():
             assert abs(deflator[year] - val) < TOLERANCE
 
+    def test_from_arrays(self, deflator):
+        assert GdpDeflator.from_arrays(2010, [2009, 2010, 2011],
+                                       [0.03] * 3, True) == deflator
+        assert GdpDeflator.from_arrays(2010, [], []) == GdpDeflator(2010, {})
+
     def test_conversion_factor(self, deflator):
         test = {(2012, 2010): (100 / 106.09),
                 (2012,): (100 / 106.09),
                 (2010, 2012): (106.09 / 100)}
         for years, val in test.items():
             assert abs(deflator.conversion_factor(*years) - val) < TOLERANCE
+
+    def test_first_rate_difference(self, deflator):
+        same = GdpDeflator(2010, {2009: 0.03, 2010: 0.03, 2011: 0.03}, True)
+        changed = GdpDeflator(2010, {2009: 0.03, 2010: 0.03, 2011: 0.04},
+                              True)
+        assert deflator.first_rate_difference(same) is None
+        assert deflator.first_rate_difference(changed) == 1
+        unextended = GdpDeflator(2010, {2009: 0.03, 2010: 0.03, 2011: 0.03})
+        assert deflator.first_rate_difference(unextended) == -1
+
+    def test_rebase_prices(self, deflator):
+        values = [100, 200, 300, 400]
+        years = [2012, 2005, 2010, 2030]
+        for year_to in (None, 2015):
+            result = deflator.rebase_prices(values, years, year_to)
+            for value, year, converted in zip(values, years, result):
+                assert converted == value * deflator.conversion_factor(
+                    year, year_to
+                )
+        assert len(deflator.rebase_prices([], [])) == 0
+        with pytest.raises(ValueError):
+            deflator.rebase_prices([100], [])
+
+    def test_ledger_view(self, deflator):
+        ledger = [(100, 2012), (200, 2005), (300, 2010), (400, 2030)]
+        view = deflator.ledger_view(ledger, 2015)
+        expected = list(deflator.rebase_prices(*zip(*ledger), year_to=2015))
+        assert len(view) == 4
+        assert list(view) == expected
+        assert view[-1] == expected[-1]
+        assert list(view[1:3]) == expected[1:3]
+        assert list(view[::-2]) == expected[::-2]
+        ledger.append((500, 2010))
+        assert len(view) == 5
+        assert abs(view[4] - 500 * (1.03 ** 5)) < TOLERANCE
+        with pytest.raises(IndexError):
+            view[5]
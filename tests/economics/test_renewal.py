@@ -0,0 +1,72 @@
+import pytest
+
+from py_wlc.economics import Discount, RenewalCycle, ResidualValueCalculator
+
+TOLERANCE = 0.0001
+
+ASSETS = [(1000, 25, 2010, 0.0), (500, 10, 1985, 50), (200, 7, 2000, 0.0),
+          (300, 200, 1990, 30), (100, 5, 2200, 0.0), (400, 40, 2050, 0.0)]
+
+@pytest.fixture(scope="module")
+def discount():
+    return Discount(2010)
+
+@pytest.fixture(scope="module")
+def calc():
+    return ResidualValueCalculator("linear")
+
+@pytest.fixture(scope="module")
+def cycle(discount, calc):
+    return RenewalCycle(discount, calc, 2010, 2129)
+
+
+def brute_force(discount, calc, start, end):
+    out = []
+    for value, life, build, scrap in ASSETS:
+        renewals, last_build = 0.0, build
+        year = build + life
+        while year <= end:
+            if year >= start:
+                renewals += value * discount[year]
+            last_build = year
+            year += life
+        residual = 0.0
+        if build <= end:
+            residual = (calc.calculate(value, life, last_build, end, scrap) *
+                        discount[end])
+        out.append((renewals, residual))
+    return out
+
+
+class TestRenewalCycle:
+
+    def test_evaluate(self, cycle, discount, calc):
+        expected = brute_force(discount, calc, 2010, 2129)
+        for (renewals, residual), (exp_ren, exp_res) in zip(
+                cycle.evaluate(ASSETS), expected):
+            assert abs(renewals - exp_ren) < TOLERANCE
+            assert abs(residual - exp_res) < TOLERANCE
+
+    def test_four_renewals(self, cycle, discount):
+        renewals, residual = cycle.evaluate([(1000, 25, 2010, 0.0)])[0]
+        assert abs(renewals - 1000 * sum(discount[year] for year in
+                                         (2035, 2060, 2085, 2110))) < TOLERANCE
+        assert abs(residual - 1000 * (6 / 25) * discount[2129]) < TOLERANCE
+
+    def test_total_and_stream(self, cycle):
+        renewals, residual = cycle.total(ASSETS)
+        results = cycle.evaluate(ASSETS)
+        assert abs(renewals - sum(ren for ren, _ in results)) < TOLERANCE
+        assert abs(residual - sum(res for _, res in results)) < TOLERANCE
+        stream = cycle.stream(ASSETS)
+        assert len(stream) == 120
+        assert abs(sum(stream) - renewals) < TOLERANCE
+        assert cycle.stream(ASSETS[::-1]) == stream
+
+    def test_failure(self, discount, calc, cycle):
+        with pytest.raises(ValueError):
+            RenewalCycle(discount, calc, 2010, 2009)
+        with pytest.raises(ValueError):
+            cycle.evaluate([(1000, 0, 2010, 0.0)])
+        with pytest.raises(ValueError):
+            cycle.stream([(1000, 0, 2010, 0.0)])
@@ -1,6 +1,7 @@
 import pytest
 
-from py_wlc.economics import ResidualValueCalculator
+from py_wlc.economics import (Annuity, DecliningBalance, DepreciationMethod,
+                              ResidualValueCalculator)
 
 TOLERANCE = 0.0001
 
@@ -41,3 +42,82 @@ class TestResidualValue:
             _ = ResidualValueCalculator("this won't work")
         with pytest.raises(ValueError):
             calc.calculate(1000, 5, 0, -1, 100)
+
+
+class TestSchedule:
+
+    ASSETS = [(17000, 5, 2010, 2000), (1000, 5, 2012, 100),
+              (500, 40, 1990, 0.0), (2500, 1, 2015, 10)]
+
+    def test_matches_calculate(self):
+        for method in ResidualValueCalculator.available_methods():
+            calc = ResidualValueCalculator(method)
+            rows = calc.schedule(self.ASSETS, 2008, 2020)
+            assert len(rows) == len(self.ASSETS)
+            for (value, life, build, scrap), row in zip(self.ASSETS, rows):
+                assert len(row) == 13
+                for year, result in zip(range(2008, 2021), row):
+                    if year < build:
+                        assert result == 0.0
+                        continue
+                    expected = calc.calculate(value, life, build, year, scrap)
+                    assert abs(result - expected) < TOLERANCE
+
+    def test_single_year(self, calc):
+        assert calc.schedule([(1000, 5, 2010, 100)], 2012, 2012) == [[640]]
+        assert calc.schedule([], 2010, 2020) == []
+
+    def test_failure(self, calc):
+        with pytest.raises(ValueError):
+            calc.schedule(self.ASSETS, 2020, 2019)
+
+
+@pytest.fixture()
+def registry(request):
+    methods = dict(ResidualValueCalculator.METHODS)
+    def restore():
+        ResidualValueCalculator.METHODS.clear()
+        ResidualValueCalculator.METHODS.update(methods)
+    request.addfinalizer(restore)
+    return ResidualValueCalculator.METHODS
+
+
+class TestRegistry:
+
+    def test_declining_balance(self, registry):
+        ResidualValueCalculator.register_method("declining-200",
+                                                DecliningBalance(2))
+        calc = ResidualValueCalculator("declining-200")
+        double = ResidualValueCalculator("double-declining")
+        for end in range(7):
+            assert (calc.calculate(1000, 5, 0, end, 100) ==
+                    double.calculate(1000, 5, 0, end, 100))
+        assert (calc.schedule([(1000, 5, 0, 100)], 0, 6) ==
+                double.schedule([(1000, 5, 0, 100)], 0, 6))
+
+    def test_annuity(self, registry):
+        ResidualValueCalculator.register_method("annuity", Annuity(0.05))
+        calc = ResidualValueCalculator("annuity")
+        linear = ResidualValueCalculator("linear")
+        assert abs(calc.calculate(1000, 5, 0, 5, 100) - 100) < TOLERANCE
+        for end in range(1, 5):
+            assert (calc.calculate(1000, 5, 0, end, 100) >
+                    linear.calculate(1000, 5, 0, end, 100))
+        ResidualValueCalculator.register_method("flat", Annuity(0))
+        assert (ResidualValueCalculator("flat").calculate(1000, 5, 0, 2, 100)
+                == linear.calculate(1000, 5, 0, 2, 100))
+
+    def test_scalar_only(self, registry):
+        ResidualValueCalculator.register_method("half", DepreciationMethod(
+            lambda value, life, build, target, scrap: value / 2))
+        calc = ResidualValueCalculator("half")
+        assert "half" in calc.available_methods()
+        assert calc.calculate(1000, 5, 0, 2, 100) == 500
+        assert calc.schedule([(1000, 5, 0, 100)], 0, 6) == [
+            [1000, 500, 500, 500, 500, 500, 100]]
+
+    def test_failure(self, registry):
+        with pytest.raises(TypeError):
+            ResidualValueCalculator.register_method("bad", lambda: None)
+        with pytest.raises(NotImplementedError):
+            DepreciationMethod().scalar(1000, 5, 0, 2, 100)
@@ -0,0 +1,86 @@
+import math
+import sys
+
+import pytest
+
+from py_wlc.data.synthetic import cost_portfolio
+from py_wlc.economics import (AppraisalRunner, Cost, Discount, GdpDeflator,
+                              RenewalCycle, ResidualValueCalculator)
+from py_wlc.economics.stream import convert_batch
+
+TOLERANCE = 0.0001
+
+needs_shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="shared_memory requires Python 3.8"
+)
+
+ASSETS = [(1000, 25, 2010, 0.0), (500, 10, 1985, 50), (200, 7, 2000, 0.0),
+          (300, 200, 1990, 30), (100, 5, 2200, 0.0), (400, 40, 2050, 0.0)]
+
+@pytest.fixture(scope="module")
+def discount():
+    return Discount(2010)
+
+@pytest.fixture(scope="module")
+def deflator():
+    return GdpDeflator(2010, {2010: 0.03}, True)
+
+@pytest.fixture(scope="module")
+def costs():
+    return list(cost_portfolio(500, start_year=2010, end_year=2069))
+
+
+class TestAppraisalRunner:
+
+    def test_serial(self, discount, deflator, costs):
+        runner = AppraisalRunner(discount, deflator, 2010, 2069,
+                                 chunk_size=100, workers=0)
+        result = runner.run(costs, ASSETS)
+        expected = math.fsum(convert_batch(costs, Cost.PRESENT_VALUE,
+                                           discount, deflator))
+        assert abs(result.costs - expected) < TOLERANCE
+        renewals, residual = RenewalCycle(
+            discount, ResidualValueCalculator("linear"), 2010, 2069
+        ).total(ASSETS)
+        assert abs(result.renewals - renewals) < TOLERANCE
+        assert abs(result.residual - residual) < TOLERANCE
+        assert sum(stats["items"] for stats in
+                   result.throughput.values()) == len(costs) + len(ASSETS)
+
+    @needs_shared_memory
+    def test_parallel_matches_serial(self, discount, deflator, costs):
+        serial = AppraisalRunner(discount, deflator, 2010, 2069,
+                                 chunk_size=50, workers=0).run(costs, ASSETS)
+        parallel = AppraisalRunner(discount, deflator, 2010, 2069,
+                                   chunk_size=50, workers=2).run(costs, ASSETS)
+        assert parallel[:3] == serial[:3]
+        assert sum(stats["items"] for stats in
+                   parallel.throughput.values()) == len(costs) + len(ASSETS)
+        for stats in parallel.throughput.values():
+            assert stats["rate"] > 0
+
+    def test_chunk_size_independent(self, discount, deflator, costs):
+        results = {AppraisalRunner(discount, deflator, 2010, 2069,
+                                   chunk_size=size, workers=0
+                                   ).run(costs, ASSETS)[:3]
+                   for size in (1, 7, 100, 1000)}
+        assert len(results) == 1
+
+    @needs_shared_memory
+    def test_empty(self, discount, deflator):
+        result = AppraisalRunner(discount, deflator, 2010, 2069,
+                                 workers=2).run()
+        assert result == (0.0, 0.0, 0.0, {})
+
+    def test_year_outside_appraisal(self, discount, deflator):
+        runner = AppraisalRunner(discount, deflator, 2010, 2069, workers=0)
+        with pytest.raises(ValueError):
+            runner.run([(100, Cost.NOMINAL, 2070, 1)])
+
+    def test_invalid_arguments(self, discount, deflator):
+        with pytest.raises(ValueError):
+            AppraisalRunner(discount, deflator, 2010, 2069, chunk_size=0)
+        with pytest.raises(ValueError):
+            AppraisalRunner(discount, deflator, 2010, 2069, workers=-1)
+        with pytest.raises(ValueError):
+            AppraisalRunner(discount, deflator, 2010, 2069, method="foo")
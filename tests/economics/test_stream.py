@@ -0,0 +1,94 @@
+import asyncio
+from itertools import count
+
+import pytest
+
+from py_wlc.economics import Cost, Discount, GdpDeflator
+from py_wlc.economics.stream import (aconvert_stream, convert_batch,
+                                     convert_records, convert_stream)
+
+TOLERANCE = 0.0001
+
+RECORDS = [(100, Cost.NOMINAL, 2011, 1.19),
+           (119, Cost.MARKET_PRICE, 2011, 1.19),
+           (100, Cost.PRESENT_VALUE, 2015, 1),
+           (50, Cost.REAL | Cost.MARKET_PRICE, 2020, 1.2),
+           (75, Cost.NOMINAL, 2009, 1)]
+
+@pytest.fixture(scope="module")
+def discount():
+    return Discount(2010)
+
+@pytest.fixture(scope="module")
+def deflator():
+    return GdpDeflator(2010, {2010: 0.03}, True)
+
+
+class TestConvertBatch:
+
+    def test_matches_cost(self, discount, deflator):
+        for type_ in (Cost.NOMINAL, Cost.REAL | Cost.MARKET_PRICE,
+                      Cost.PRESENT_VALUE):
+            result = convert_batch(RECORDS, type_, discount, deflator)
+            for record, value in zip(RECORDS, result):
+                cost = Cost(record[0], record[1], record[2],
+                            discount, deflator, record[3])
+                assert cost.as_type(type_) == value
+
+    def test_invalid_type(self, discount, deflator):
+        with pytest.raises(ValueError):
+            convert_batch(RECORDS, Cost.REAL | Cost.NOMINAL,
+                          discount, deflator)
+        with pytest.raises(ValueError):
+            convert_batch([(1, Cost.REAL | Cost.NOMINAL, 2010, 1)],
+                          Cost.REAL, discount, deflator)
+
+    def test_convert_records(self, discount, deflator):
+        factors = {year: (discount[year], 1 / deflator[year])
+                   for year in (2009, 2011, 2015, 2020)}
+        assert (convert_records(RECORDS, Cost.REAL, factors) ==
+                convert_batch(RECORDS, Cost.REAL, discount, deflator))
+
+
+class TestConvertStream:
+
+    def test_batches(self, discount, deflator):
+        batches = list(convert_stream(RECORDS, Cost.REAL,
+                                      discount, deflator, 2))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert ([value for batch in batches for value in batch] ==
+                convert_batch(RECORDS, Cost.REAL, discount, deflator))
+
+    def test_unbounded(self, discount, deflator):
+        records = ((1, Cost.NOMINAL, 2010 + (i % 50), 1) for i in count())
+        stream = convert_stream(records, Cost.REAL, discount, deflator, 10)
+        for _ in range(100):
+            assert len(next(stream)) == 10
+
+    def test_batch_size(self, discount, deflator):
+        with pytest.raises(ValueError):
+            next(convert_stream(RECORDS, Cost.REAL, discount, deflator, 0))
+
+
+class TestAsyncConvertStream:
+
+    @staticmethod
+    def collect(records, discount, deflator):
+        async def run():
+            return [batch async for batch in
+                    aconvert_stream(records, Cost.REAL,
+                                    discount, deflator, 2)]
+        return asyncio.run(run())
+
+    def test_plain_iterable(self, discount, deflator):
+        batches = self.collect(RECORDS, discount, deflator)
+        assert batches == list(convert_stream(RECORDS, Cost.REAL,
+                                              discount, deflator, 2))
+
+    def test_async_iterable(self, discount, deflator):
+        async def records():
+            for record in RECORDS:
+                yield record
+        batches = self.collect(records(), discount, deflator)
+        assert batches == list(convert_stream(RECORDS, Cost.REAL,
+                                              discount, deflator, 2))
@@ -1,6 +1,6 @@
 import pytest
 
-from py_wlc.generic import ExtendedDict
+from py_wlc.generic import ExtendedDict, RateBands, ValueSeries
 
 @pytest.fixture(scope="module")
 def ext_dict():
@@ -20,3 +20,58 @@ class TestExtendedDict:
     def test_get(self, ext_dict):
         assert ext_dict.get(0) is None
         assert ext_dict.get(0, 0) == 0
+
+
+class TestValueSeries:
+
+    def test_getitem(self):
+        series = ValueSeries({2010: 1.0, 2011: 2.0, 2013: 3.0})
+        assert series[2009] == 1.0
+        assert series[2011] == 2.0
+        assert series[2014] == 3.0
+        with pytest.raises(KeyError):
+            _ = series[2012]
+        assert series.get(2012) is None
+        assert len(series) == 3
+        assert list(series) == [2010, 2011, 2013]
+
+    def test_from_arrays(self):
+        series = ValueSeries.from_arrays([2010, 2011], [1.0, 2.0])
+        assert series == ValueSeries({2011: 2.0, 2010: 1.0})
+        assert hash(series) == hash(ValueSeries({2011: 2.0, 2010: 1.0}))
+        assert list(series.items()) == [(2010, 1.0), (2011, 2.0)]
+
+    def test_empty(self):
+        with pytest.raises(KeyError):
+            _ = ValueSeries({})[2010]
+
+
+class TestRateBands:
+
+    def test_getitem(self):
+        rates = {0: 0.035, 31: 0.03, 76: 0.025}
+        bands = RateBands(rates)
+        infilled = ExtendedDict(rates)
+        for year in range(76):
+            if year not in infilled:
+                infilled[year] = infilled[year - 1]
+        for year in range(-10, 100):
+            assert bands[year] == infilled[year]
+        assert bands.get(10) == 0.035
+
+    def test_merged(self):
+        bands = RateBands({0: 0.035, 10: 0.035, 31: 0.03})
+        assert list(bands.items()) == [(0, 0.035), (31, 0.03)]
+        assert bands == RateBands({0: 0.035, 31: 0.03})
+        assert hash(bands) == hash(RateBands({0: 0.035, 31: 0.03}))
+        assert bands != RateBands({0: 0.035, 30: 0.03})
+
+    def test_from_arrays(self):
+        bands = RateBands.from_arrays([0, 10, 31], [0.035, 0.035, 0.03])
+        assert bands == RateBands({0: 0.035, 31: 0.03})
+
+    def test_empty(self):
+        bands = RateBands({})
+        with pytest.raises(KeyError):
+            bands[0]
+        assert bands.get(0) is None
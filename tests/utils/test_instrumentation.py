@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+
+from py_wlc.economics import Cost, Discount, GdpDeflator
+from py_wlc.economics.residual_value import sum_of_years_digits
+from py_wlc.generic import ExtendedDict
+from py_wlc.utils import instrumentation
+
+
+@pytest.fixture()
+def clean(request):
+    instrumentation.reset()
+    request.addfinalizer(instrumentation.reset)
+    request.addfinalizer(instrumentation.disable)
+
+
+class TestInstrumentation:
+
+    def test_disabled(self, clean):
+        Discount(2010)[2050]
+        assert instrumentation.snapshot() == {}
+
+    def test_measure(self, clean):
+        with instrumentation.measure() as counters:
+            discount = Discount(2010)
+            discount[2050]
+            discount[2040]
+            discount[2060]
+            ExtendedDict({0: 1})[5]
+            Cost(100, Cost.NOMINAL, 2010, discount,
+                 GdpDeflator(2010, {}), 1)
+        assert not instrumentation.ENABLED
+        growth = counters["py_wlc.generic.growth"]["extend_values"]
+        assert growth["count"] == 2
+        assert growth["time"] >= 0
+        assert counters["py_wlc.generic"]["clamp"]["count"] == 1
+        assert counters["py_wlc.economics.cost"]["cost_init"]["count"] == 1
+
+    def test_nested_scope(self, clean):
+        instrumentation.enable()
+        ExtendedDict({0: 1})[5]
+        with instrumentation.measure() as counters:
+            ExtendedDict({0: 1})[-5]
+        assert instrumentation.ENABLED
+        assert counters["py_wlc.generic"]["clamp"]["count"] == 1
+        snapshot = instrumentation.snapshot()
+        assert snapshot["py_wlc.generic"]["clamp"]["count"] == 2
+
+    def test_memo_miss(self, clean):
+        sum_of_years_digits.cache.clear()
+        with instrumentation.measure() as counters:
+            sum_of_years_digits(3)
+            sum_of_years_digits(3)
+        events = counters["py_wlc.economics.residual_value"]
+        assert events["memo_miss"]["count"] == 4
+
+    def test_logging(self, clean, caplog):
+        with caplog.at_level(logging.DEBUG, logger="py_wlc"):
+            with instrumentation.measure(log=True):
+                ExtendedDict({0: 1})[5]
+        assert any(record.name == "py_wlc.generic" and
+                   "clamp: count=1" in record.getMessage()
+                   for record in caplog.records)
@@ -0,0 +1,52 @@
+import math
+import pickle
+import random
+
+from py_wlc.utils.summation import ExactSum
+
+
+def values(count, seed=0):
+    rand = random.Random(seed)
+    return [rand.lognormvariate(9, 3) * rand.choice((1, -1))
+            for _ in range(count)]
+
+
+class TestExactSum:
+
+    def test_exact(self):
+        assert float(ExactSum([1e16, 1.0, -1e16])) == 1.0
+        assert float(ExactSum([0.1] * 10)) == 1.0
+        assert float(ExactSum()) == 0.0
+
+    def test_order_independent(self):
+        data = values(5000)
+        expected = math.fsum(data)
+        shuffled = data[:]
+        random.Random(1).shuffle(shuffled)
+        assert float(ExactSum(data)) == expected
+        assert float(ExactSum(shuffled)) == expected
+
+    def test_merge(self):
+        data = values(5000)
+        for size in (1, 7, 1000):
+            total = ExactSum()
+            for start in range(0, len(data), size):
+                total.merge(ExactSum(data[start:start + size]))
+            assert float(total) == math.fsum(data)
+
+    def test_add(self):
+        total = ExactSum()
+        for value in values(100):
+            total.add(value)
+        assert float(total) == math.fsum(values(100))
+
+    def test_non_finite(self):
+        assert float(ExactSum([float("inf"), 1.0])) == float("inf")
+        for count in (1, 10):
+            mixed = [float("inf"), float("-inf")] * count
+            assert math.isnan(float(ExactSum(mixed)))
+            assert math.isnan(sum(mixed))
+
+    def test_pickle(self):
+        total = ExactSum(values(100))
+        assert pickle.loads(pickle.dumps(total)).partials == total.partials